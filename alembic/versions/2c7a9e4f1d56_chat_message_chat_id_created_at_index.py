@@ -0,0 +1,38 @@
+"""add chat message (chat_id, created_at) index
+
+Revision ID: 2c7a9e4f1d56
+Revises: 6f0b2d8c4e13
+Create Date: 2026-10-19 17:58:09.114625
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "2c7a9e4f1d56"
+down_revision: Union[str, Sequence[str], None] = "6f0b2d8c4e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("chat_message"):
+        op.create_index(
+            "ix_chat_message_chat_id_created_at",
+            "chat_message",
+            ["chat_id", "created_at"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_chat_message_chat_id_created_at",
+        table_name="chat_message",
+        if_exists=True,
+    )
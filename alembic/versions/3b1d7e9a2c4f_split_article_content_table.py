@@ -0,0 +1,86 @@
+"""split article content into compressed table
+
+Revision ID: 3b1d7e9a2c4f
+Revises: 0e68dc1847c5
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "3b1d7e9a2c4f"
+down_revision: Union[str, Sequence[str], None] = "0e68dc1847c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def article_columns() -> list[str]:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("article"):
+        return []
+    return [column["name"] for column in inspector.get_columns("article")]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_content",
+        sa.Column("article_id", sa.Uuid(), sa.ForeignKey("article.id"), primary_key=True),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("encoding", sa.String(), nullable=False),
+        if_not_exists=True,
+    )
+
+    if "content" not in article_columns():
+        return
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, content FROM article WHERE content IS NOT NULL AND content != ''")
+    ).all()
+    if rows:
+        connection.execute(
+            sa.text(
+                "INSERT INTO article_content (article_id, body, encoding) "
+                "VALUES (:article_id, :body, 'zlib')"
+            ),
+            [
+                {
+                    "article_id": row.id,
+                    "body": zlib.compress(row.content.encode("utf-8"), 6),
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table("article") as batch_op:
+        batch_op.drop_column("content")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if "content" not in article_columns():
+        with op.batch_alter_table("article") as batch_op:
+            batch_op.add_column(
+                sa.Column("content", sa.String(), nullable=False, server_default="")
+            )
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT article_id, body FROM article_content")
+    ).all()
+    for row in rows:
+        connection.execute(
+            sa.text("UPDATE article SET content = :content WHERE id = :article_id"),
+            {"content": zlib.decompress(row.body).decode("utf-8"), "article_id": row.article_id},
+        )
+
+    op.drop_table(
+        "article_content",
+        if_exists=True,
+    )
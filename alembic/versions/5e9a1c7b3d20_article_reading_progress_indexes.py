@@ -0,0 +1,59 @@
+"""add reading progress and article feed indexes
+
+Revision ID: 5e9a1c7b3d20
+Revises: 8c52f0d9e6a1
+Create Date: 2026-10-19 14:26:03.871145
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "5e9a1c7b3d20"
+down_revision: Union[str, Sequence[str], None] = "8c52f0d9e6a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table("article"):
+        op.create_index(
+            "ix_article_created_at_id",
+            "article",
+            ["created_at", "id"],
+            if_not_exists=True,
+        )
+
+    if inspector.has_table("article_readed"):
+        # Keep the first read of each article before adding the unique index
+        op.execute(
+            "DELETE FROM article_readed WHERE rowid NOT IN ("
+            "SELECT MIN(rowid) FROM article_readed GROUP BY user_id, article_id)"
+        )
+        op.create_index(
+            "ix_article_readed_user_id_article_id",
+            "article_readed",
+            ["user_id", "article_id"],
+            unique=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_article_readed_user_id_article_id",
+        table_name="article_readed",
+        if_exists=True,
+    )
+    op.drop_index(
+        "ix_article_created_at_id",
+        table_name="article",
+        if_exists=True,
+    )
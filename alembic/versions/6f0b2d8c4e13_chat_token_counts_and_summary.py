@@ -0,0 +1,85 @@
+"""add chat message token counts and rolling chat summary
+
+Revision ID: 6f0b2d8c4e13
+Revises: d71e3b5a9f08
+Create Date: 2026-10-19 17:21:45.930276
+
+"""
+
+import math
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+revision: str = "6f0b2d8c4e13"
+down_revision: Union[str, Sequence[str], None] = "d71e3b5a9f08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the token counter, later changes to utils.tokens must not
+# change this migration
+TOKENIZER_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 4
+
+
+def token_counter():
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            return lambda text: len(encoding.encode(text or ""))
+        except Exception:
+            pass
+    return lambda text: math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    chat_columns = columns("chat")
+    if chat_columns:
+        with op.batch_alter_table("chat") as batch_op:
+            if "summary" not in chat_columns:
+                batch_op.add_column(sa.Column("summary", sa.String(), nullable=True))
+            if "summary_until" not in chat_columns:
+                batch_op.add_column(sa.Column("summary_until", sa.DateTime(), nullable=True))
+
+    message_columns = columns("chat_message")
+    if not message_columns:
+        return
+
+    if "token_count" not in message_columns:
+        with op.batch_alter_table("chat_message") as batch_op:
+            batch_op.add_column(sa.Column("token_count", sa.Integer(), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, content FROM chat_message WHERE token_count IS NULL")
+    ).all()
+    if rows:
+        count_tokens = token_counter()
+        connection.execute(
+            sa.text("UPDATE chat_message SET token_count = :token_count WHERE id = :id"),
+            [{"id": row.id, "token_count": count_tokens(row.content)} for row in rows],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("chat_message") as batch_op:
+        batch_op.drop_column("token_count")
+    with op.batch_alter_table("chat") as batch_op:
+        batch_op.drop_column("summary_until")
+        batch_op.drop_column("summary")
@@ -0,0 +1,32 @@
+"""add updated_at to article content
+
+Revision ID: 8c52f0d9e6a1
+Revises: 3b1d7e9a2c4f
+Create Date: 2026-10-19 11:04:17.552930
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "8c52f0d9e6a1"
+down_revision: Union[str, Sequence[str], None] = "3b1d7e9a2c4f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "article_content",
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("article_content") as batch_op:
+        batch_op.drop_column("updated_at")
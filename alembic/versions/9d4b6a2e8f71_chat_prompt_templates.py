@@ -0,0 +1,173 @@
+"""store system prompts as versioned templates referenced by chats
+
+Revision ID: 9d4b6a2e8f71
+Revises: 2c7a9e4f1d56
+Create Date: 2026-10-19 18:40:33.275810
+
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+from uuid import uuid4
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "9d4b6a2e8f71"
+down_revision: Union[str, Sequence[str], None] = "2c7a9e4f1d56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENGLISH_TEACHER = "english_teacher"
+
+# Frozen copies, later template versions must not change this migration
+ENGLISH_TEACHER_V1 = """You are an "English Teacher" for Brazilian people, you speak English and Portuguese fluently, and you are specialized in the conversation theme given at the end.
+The user will talk with you about this theme in English, and sometimes in Portuguese.
+Your tasks are:
+
+- If the user makes a mistake, first correct it (showing the corrected version in a natural way).
+- After correcting, answer the user to keep the conversation flowing.
+- If the user doesn't understand something, explain it in a different way or in Portuguese if the user prefers.
+- Your responses should be short and concise, like a text message.
+
+Keep the conversation natural, immersive, and engaging, like a real-life situation.
+Your main goal: help the user practice English through conversation, correction, and vocabulary expansion, without breaking the immersion of the chosen theme.
+
+Conversation theme: $theme"""
+
+# Prompt that used to be stored as the first developer message of each chat
+LEGACY_START_MESSAGE = """
+You are an "English Teacher" for Brazilian people, you speak English and Portuguese fluently, and you are specialized in $theme.
+The user will talk with you about this theme in English, and sometimes in Portuguese.
+Your tasks are:
+
+- If the user makes a mistake, first correct it (showing the corrected version in a natural way).
+- After correcting, answer the user to keep the conversation flowing.
+- If the user doesn't understand something, explain it in a different way or in Portuguese if the user prefers.
+- Your responses should be short and concise, like a text message.
+
+Keep the conversation natural, immersive, and engaging, like a real-life situation.
+Your main goal: help the user practice English through conversation, correction, and vocabulary expansion, without breaking the immersion of the chosen theme
+"""
+
+
+def legacy_theme(content: str) -> str | None:
+    prefix, suffix = LEGACY_START_MESSAGE.split("$theme")
+    if content.startswith(prefix) and content.endswith(suffix):
+        return content[len(prefix) : len(content) - len(suffix)]
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "prompt_template",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_prompt_template_name_version",
+        "prompt_template",
+        ["name", "version"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if not inspector.has_table("chat"):
+        return
+
+    chat_columns = {column["name"] for column in inspector.get_columns("chat")}
+    with op.batch_alter_table("chat") as batch_op:
+        if "prompt_template_id" not in chat_columns:
+            batch_op.add_column(
+                sa.Column(
+                    "prompt_template_id",
+                    sa.Integer(),
+                    sa.ForeignKey("prompt_template.id", name="fk_chat_prompt_template_id"),
+                    nullable=True,
+                )
+            )
+        if "theme" not in chat_columns:
+            batch_op.add_column(sa.Column("theme", sa.String(), nullable=True))
+
+    connection.execute(
+        sa.text(
+            "INSERT OR IGNORE INTO prompt_template (name, version, content, created_at) "
+            "VALUES (:name, 1, :content, :created_at)"
+        ),
+        {"name": ENGLISH_TEACHER, "content": ENGLISH_TEACHER_V1, "created_at": datetime.now()},
+    )
+    template_id = connection.execute(
+        sa.text("SELECT id FROM prompt_template WHERE name = :name AND version = 1"),
+        {"name": ENGLISH_TEACHER},
+    ).scalar_one()
+
+    # Chats whose prompt is the unmodified legacy one point to the template
+    # instead; anything else keeps its developer message
+    rows = connection.execute(
+        sa.text(
+            "SELECT id, chat_id, content FROM chat_message "
+            "WHERE role = 'developer' ORDER BY created_at"
+        )
+    ).all()
+    converted = {}
+    for row in rows:
+        theme = legacy_theme(row.content)
+        if theme is not None and row.chat_id not in converted:
+            converted[row.chat_id] = (row.id, theme)
+
+    if converted:
+        connection.execute(
+            sa.text(
+                "UPDATE chat SET prompt_template_id = :template_id, theme = :theme "
+                "WHERE id = :chat_id"
+            ),
+            [
+                {"chat_id": chat_id, "template_id": template_id, "theme": theme}
+                for chat_id, (_, theme) in converted.items()
+            ],
+        )
+        connection.execute(
+            sa.text("DELETE FROM chat_message WHERE id = :id"),
+            [{"id": message_id} for message_id, _ in converted.values()],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            "SELECT chat.id, chat.theme, chat.created_at FROM chat "
+            "WHERE chat.prompt_template_id IS NOT NULL"
+        )
+    ).all()
+    if rows:
+        connection.execute(
+            sa.text(
+                "INSERT INTO chat_message (id, role, content, created_at, chat_id) "
+                "VALUES (:id, 'developer', :content, :created_at, :chat_id)"
+            ),
+            [
+                {
+                    "id": uuid4().hex,
+                    "content": LEGACY_START_MESSAGE.replace("$theme", row.theme or "general conversation"),
+                    "created_at": row.created_at,
+                    "chat_id": row.id,
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table("chat") as batch_op:
+        batch_op.drop_column("theme")
+        batch_op.drop_column("prompt_template_id")
+    op.drop_index("ix_prompt_template_name_version", table_name="prompt_template", if_exists=True)
+    op.drop_table("prompt_template", if_exists=True)
@@ -0,0 +1,114 @@
+"""add article vocabulary and card word index
+
+Revision ID: a4f2c8e61b97
+Revises: 5e9a1c7b3d20
+Create Date: 2026-10-19 15:08:52.604317
+
+"""
+
+import re
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "a4f2c8e61b97"
+down_revision: Union[str, Sequence[str], None] = "5e9a1c7b3d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the tokenizer, later changes to utils.text must not change
+# this migration
+MARKDOWN_LINK_TARGET = re.compile(r"\]\([^)]*\)")
+URL = re.compile(r"https?://\S+")
+WORD = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+
+def vocabulary(text: str) -> set[str]:
+    text = MARKDOWN_LINK_TARGET.sub("]", text or "")
+    text = URL.sub(" ", text)
+    return set(WORD.findall(text.lower().replace("’", "'")))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_vocabulary",
+        sa.Column("article_id", sa.Uuid(), sa.ForeignKey("article.id"), primary_key=True),
+        sa.Column("words", sa.String(), nullable=False),
+        sa.Column("word_count", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "card_word",
+        sa.Column("card_id", sa.Uuid(), sa.ForeignKey("card.id"), primary_key=True),
+        sa.Column("word", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.Uuid(), sa.ForeignKey("user.id"), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_card_word_user_id_word",
+        "card_word",
+        ["user_id", "word"],
+        if_not_exists=True,
+    )
+
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+
+    if inspector.has_table("article_content"):
+        rows = connection.execute(
+            sa.text(
+                "SELECT article_id, body FROM article_content WHERE article_id NOT IN "
+                "(SELECT article_id FROM article_vocabulary)"
+            )
+        ).all()
+        if rows:
+            vocabularies = [
+                (row.article_id, vocabulary(zlib.decompress(row.body).decode("utf-8")))
+                for row in rows
+            ]
+            connection.execute(
+                sa.text(
+                    "INSERT INTO article_vocabulary (article_id, words, word_count) "
+                    "VALUES (:article_id, :words, :word_count)"
+                ),
+                [
+                    {
+                        "article_id": article_id,
+                        "words": " ".join(sorted(words)),
+                        "word_count": len(words),
+                    }
+                    for article_id, words in vocabularies
+                ],
+            )
+
+    if inspector.has_table("card"):
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, author_id, front FROM card WHERE author_id IS NOT NULL "
+                "AND id NOT IN (SELECT card_id FROM card_word)"
+            )
+        ).all()
+        card_words = [
+            {"card_id": row.id, "user_id": row.author_id, "word": word}
+            for row in rows
+            for word in vocabulary(row.front or "")
+        ]
+        if card_words:
+            connection.execute(
+                sa.text(
+                    "INSERT INTO card_word (card_id, word, user_id) "
+                    "VALUES (:card_id, :word, :user_id)"
+                ),
+                card_words,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_card_word_user_id_word", table_name="card_word", if_exists=True)
+    op.drop_table("card_word", if_exists=True)
+    op.drop_table("article_vocabulary", if_exists=True)
@@ -0,0 +1,36 @@
+"""add ai_usage table with model requests and tokens per user and day
+
+Revision ID: b3e8f1a7c295
+Revises: 9d4b6a2e8f71
+Create Date: 2026-10-19 19:22:47.508136
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b3e8f1a7c295"
+down_revision: Union[str, Sequence[str], None] = "9d4b6a2e8f71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ai_usage",
+        sa.Column("user_id", sa.Uuid(), sa.ForeignKey("user.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("requests", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("ai_usage", if_exists=True)
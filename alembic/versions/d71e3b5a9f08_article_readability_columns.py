@@ -0,0 +1,133 @@
+"""add article readability columns
+
+Revision ID: d71e3b5a9f08
+Revises: a4f2c8e61b97
+Create Date: 2026-10-19 16:02:17.482391
+
+"""
+
+import re
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "d71e3b5a9f08"
+down_revision: Union[str, Sequence[str], None] = "a4f2c8e61b97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+READABILITY_COLUMNS = {
+    "avg_sentence_length": sa.Float(),
+    "reading_ease": sa.Float(),
+    "reading_grade": sa.Float(),
+    "rare_word_ratio": sa.Float(),
+    "difficulty": sa.Integer(),
+}
+
+# Frozen copy of the scoring, later changes to ReadabilityService or
+# utils.text must not change this migration
+BEGINNER = 1
+INTERMEDIATE = 2
+ADVANCED = 3
+BEGINNER_MAX_GRADE = 7.0
+INTERMEDIATE_MAX_GRADE = 11.0
+RARE_WORD_SYLLABLES = 3
+
+MARKDOWN_LINK_TARGET = re.compile(r"\]\([^)]*\)")
+URL = re.compile(r"https?://\S+")
+WORD = re.compile(r"[a-z]+(?:'[a-z]+)*")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+VOWEL_GROUP = re.compile(r"[aeiouy]+")
+
+
+def syllables(word: str) -> int:
+    word = word.replace("'", "")
+    count = len(VOWEL_GROUP.findall(word))
+    if count > 1 and word.endswith("e") and not word.endswith(("le", "ee")):
+        count -= 1
+    return max(count, 1)
+
+
+def score(content: str) -> dict:
+    text = URL.sub(" ", MARKDOWN_LINK_TARGET.sub("]", content))
+    words = WORD.findall(text.lower().replace("’", "'"))
+    sentence_count = sum(
+        1 for sentence in SENTENCE_BREAK.split(content) if WORD.search(sentence.lower())
+    )
+    if not words or not sentence_count:
+        return {column: None for column in READABILITY_COLUMNS}
+
+    word_syllables = [syllables(word) for word in words]
+    words_per_sentence = len(words) / sentence_count
+    syllables_per_word = sum(word_syllables) / len(words)
+    reading_grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+    rare_words = sum(1 for count in word_syllables if count >= RARE_WORD_SYLLABLES)
+    if reading_grade <= BEGINNER_MAX_GRADE:
+        difficulty = BEGINNER
+    elif reading_grade <= INTERMEDIATE_MAX_GRADE:
+        difficulty = INTERMEDIATE
+    else:
+        difficulty = ADVANCED
+    return {
+        "avg_sentence_length": round(words_per_sentence, 2),
+        "reading_ease": round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2),
+        "reading_grade": round(reading_grade, 2),
+        "rare_word_ratio": round(rare_words / len(words), 4),
+        "difficulty": difficulty,
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if not inspector.has_table("article"):
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("article")}
+    with op.batch_alter_table("article") as batch_op:
+        for name, column_type in READABILITY_COLUMNS.items():
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, column_type, nullable=True))
+
+    op.create_index("ix_article_reading_grade", "article", ["reading_grade"], if_not_exists=True)
+    op.create_index("ix_article_difficulty", "article", ["difficulty"], if_not_exists=True)
+
+    if not inspector.has_table("article_content"):
+        return
+
+    rows = connection.execute(
+        sa.text(
+            "SELECT article_content.article_id, article_content.body FROM article_content "
+            "JOIN article ON article.id = article_content.article_id "
+            "WHERE article.difficulty IS NULL"
+        )
+    ).all()
+    if rows:
+        connection.execute(
+            sa.text(
+                "UPDATE article SET avg_sentence_length = :avg_sentence_length, "
+                "reading_ease = :reading_ease, reading_grade = :reading_grade, "
+                "rare_word_ratio = :rare_word_ratio, difficulty = :difficulty "
+                "WHERE id = :article_id"
+            ),
+            [
+                {
+                    "article_id": row.article_id,
+                    **score(zlib.decompress(row.body).decode("utf-8")),
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_article_difficulty", table_name="article", if_exists=True)
+    op.drop_index("ix_article_reading_grade", table_name="article", if_exists=True)
+    with op.batch_alter_table("article") as batch_op:
+        for name in READABILITY_COLUMNS:
+            batch_op.drop_column(name)
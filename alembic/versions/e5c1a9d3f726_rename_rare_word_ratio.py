@@ -0,0 +1,40 @@
+"""rename article rare_word_ratio to complex_word_ratio
+
+Revision ID: e5c1a9d3f726
+Revises: b3e8f1a7c295
+Create Date: 2026-10-19 20:14:06.381952
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e5c1a9d3f726"
+down_revision: Union[str, Sequence[str], None] = "b3e8f1a7c295"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def rename(old: str, new: str) -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("article"):
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("article")}
+    if old in columns and new not in columns:
+        with op.batch_alter_table("article") as batch_op:
+            batch_op.alter_column(old, new_column_name=new)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The column holds the share of words with three or more syllables
+    rename("rare_word_ratio", "complex_word_ratio")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rename("complex_word_ratio", "rare_word_ratio")
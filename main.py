@@ -1,20 +1,33 @@
 import os
 import logging
 
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from dotenv import load_dotenv
 from fastapi import FastAPI
 
-from routers import articles, auth, card, core, chat
-from services import sqlite_service
+from routers import admin, articles, auth, card, core, chat
+from services import (ai_service, ai_usage_service, http_client_service,
+                      message_writer_service, parsing_pool_service, sqlite_service)
+from utils.middlewares import CompressionMiddleware
 
 load_dotenv()
 
 debug = os.getenv("DEBUG", "false").lower() == "true"
-scheduler = AsyncIOScheduler(timezone="America/Fortaleza")
+scheduler = AsyncIOScheduler(
+    timezone="America/Fortaleza",
+    executors={
+        "default": AsyncIOExecutor(),
+        # Ingestion does blocking I/O, keep it off the event loop
+        "ingestion": ThreadPoolExecutor(max_workers=1),
+    },
+)
 scheduler_hour = int(os.getenv("SCHEDULER_HOUR", "0"))
 scheduler_minute = int(os.getenv("SCHEDULER_MINUTE", "0"))
+compression_minimum_size = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
 
 app = FastAPI(
     title="Aingles API",
@@ -24,12 +37,27 @@ app = FastAPI(
     redoc_url=None if not debug else "/redoc",
     openapi_url=None if not debug else "/openapi.json",
 )
+app.state.scheduler = scheduler
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=compression_minimum_size,
+    exclude_paths=[
+        r"^/chat/[^/]+/message/stream$",
+    ],
+)
 
 
 @app.on_event("shutdown")
 async def stop_scheduler():
     logging.info("Stopping scheduler...")
     scheduler.shutdown(wait=False)
+    http_client_service.close_http_client()
+    await message_writer_service.message_writer.stop()
+    await ai_usage_service.ai_usage.flush_async()
+    ai_service.close_ai_service()
+    await http_client_service.close_async_http_client()
+    parsing_pool_service.parsing_pool.shutdown()
 
 
 @app.on_event("startup")
@@ -41,6 +69,19 @@ def on_startup() -> None:
     scheduler.add_job(
         func=articles.load_articles,
         trigger=CronTrigger(hour=scheduler_hour, minute=scheduler_minute),
+        id=articles.LOAD_ARTICLES_JOB,
+        executor="ingestion",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        func=ai_usage_service.ai_usage.flush_async,
+        trigger=IntervalTrigger(seconds=ai_usage_service.AI_USAGE_FLUSH_SECONDS),
+        id="flush_ai_usage",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
     )
     scheduler.start()
 
@@ -75,3 +116,10 @@ app.include_router(
     prefix="/chat",
     tags=["Chat"],
 )
+
+# Admin routes
+app.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["Admin"],
+)
@@ -1,26 +1,64 @@
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
+
+BEGINNER = 1
+INTERMEDIATE = 2
+ADVANCED = 3
+
+DIFFICULTIES: dict[int, str] = {
+    BEGINNER: "Beginner",
+    INTERMEDIATE: "Intermediate",
+    ADVANCED: "Advanced",
+}
 
 
 class Article(SQLModel, table=True):
     __tablename__ = "article"
+    __table_args__ = (Index("ix_article_created_at_id", "created_at", "id"),)
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     content_url: str | None = Field(default="", unique=True, index=True)
     title: str = Field(default="", index=True)
-    content: str = Field(default="")
-    created_at: datetime | None = Field(default=datetime.now())
+    created_at: datetime | None = Field(default_factory=datetime.now)
     author_id: UUID | None = Field(
         foreign_key="user.id",
     )
 
+    # Readability, computed when the content is stored
+    avg_sentence_length: float | None = Field(default=None)
+    reading_ease: float | None = Field(default=None)
+    reading_grade: float | None = Field(default=None, index=True)
+    complex_word_ratio: float | None = Field(default=None)
+    difficulty: int | None = Field(default=None, index=True)
+
+
+class ArticleContent(SQLModel, table=True):
+    __tablename__ = "article_content"
+
+    article_id: UUID = Field(foreign_key="article.id", primary_key=True)
+    body: bytes = Field(default=b"")
+    encoding: str = Field(default="zlib")
+    updated_at: datetime | None = Field(default_factory=datetime.now)
+
+
+class ArticleVocabulary(SQLModel, table=True):
+    __tablename__ = "article_vocabulary"
+
+    article_id: UUID = Field(foreign_key="article.id", primary_key=True)
+    # Distinct words of the article, sorted and separated by spaces
+    words: str = Field(default="")
+    word_count: int = Field(default=0)
+
 
 class ArticleReaded(SQLModel, table=True):
     __tablename__ = "article_readed"
+    __table_args__ = (
+        Index("ix_article_readed_user_id_article_id", "user_id", "article_id", unique=True),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    readed_at: datetime | None = Field(default=datetime.now())
+    readed_at: datetime | None = Field(default_factory=datetime.now)
     article_id: UUID = Field(foreign_key="article.id")
     user_id: UUID = Field(foreign_key="user.id")
@@ -1,7 +1,7 @@
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, Index, Relationship, SQLModel
 
 EASY = 1
 MEDIUM = 2
@@ -43,3 +43,16 @@ class CardReviewLog(SQLModel, table=True):
     difficult: int = Field(default=EASY)
 
     card: Card | None = Relationship(back_populates="reviews")
+
+
+class CardWord(SQLModel, table=True):
+    """
+    Inverted index of the words in the front of the user's cards.
+    """
+
+    __tablename__ = "card_word"
+    __table_args__ = (Index("ix_card_word_user_id_word", "user_id", "word"),)
+
+    card_id: UUID = Field(foreign_key="card.id", primary_key=True)
+    word: str = Field(primary_key=True)
+    user_id: UUID = Field(foreign_key="user.id")
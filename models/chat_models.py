@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID, uuid4
 
-from sqlmodel import Enum, Field, Relationship, SQLModel
+from sqlmodel import Enum, Field, Index, Relationship, SQLModel
 
 
 class Chat(SQLModel, table=True):
@@ -11,6 +11,14 @@ class Chat(SQLModel, table=True):
     title: str = Field()
     created_at: datetime = Field(default_factory=datetime.now)
     author_id: UUID | None = Field(foreign_key="user.id")
+    # The system prompt is rendered from the template, older chats keep it
+    # as a developer message instead
+    prompt_template_id: int | None = Field(default=None, foreign_key="prompt_template.id")
+    theme: str | None = Field(default=None)
+    # Rolling summary of the messages up to summary_until that no longer
+    # fit in the context window
+    summary: str | None = Field(default=None)
+    summary_until: datetime | None = Field(default=None)
 
     messages: list["ChatMessage"] = Relationship(back_populates="chat")
 
@@ -24,11 +32,46 @@ class MessageRole(Enum):
 
 class ChatMessage(SQLModel, table=True):
     __tablename__ = "chat_message"
+    __table_args__ = (
+        Index("ix_chat_message_chat_id_created_at", "chat_id", "created_at"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     role: str = Field()
     content: str = Field()
     created_at: datetime = Field(default_factory=datetime.now)
     chat_id: UUID = Field(foreign_key="chat.id")
+    token_count: int | None = Field(default=None)
 
     chat: Chat = Relationship(back_populates="messages")
+
+
+class PromptTemplate(SQLModel, table=True):
+    """
+    Versioned system prompts. Rows are never updated, a change is a new version.
+    """
+
+    __tablename__ = "prompt_template"
+    __table_args__ = (
+        Index("ix_prompt_template_name_version", "name", "version", unique=True),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field()
+    version: int = Field()
+    content: str = Field()
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class AIUsage(SQLModel, table=True):
+    """
+    Model usage per user and day, flushed from the in-memory counters.
+    """
+
+    __tablename__ = "ai_usage"
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    requests: int = Field(default=0)
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
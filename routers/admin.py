@@ -0,0 +1,54 @@
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException, Request
+
+from schemas.admin_schema import JobRunResponse, JobStatusResponse, ThreadpoolStatusResponse
+from services.job_metrics_service import job_metrics
+from utils.dependencies import CurrentUser
+
+router = APIRouter()
+
+
+@router.get(
+    "/jobs",
+    description="Status and metrics of the recent runs of the scheduled jobs",
+)
+def get_jobs_status(
+    current_user: CurrentUser,
+    request: Request,
+) -> list[JobStatusResponse]:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Admin access is required.")
+
+    scheduler = request.app.state.scheduler
+    job_ids = {job.id for job in scheduler.get_jobs()} | set(job_metrics.job_ids())
+
+    response = []
+    for job_id in sorted(job_ids):
+        job = scheduler.get_job(job_id)
+        runs = [JobRunResponse(**run.to_json()) for run in job_metrics.runs(job_id)]
+        response.append(
+            JobStatusResponse(
+                job_id=job_id,
+                next_run_at=job.next_run_time if job else None,
+                last_run=runs[0] if runs else None,
+                recent_runs=runs,
+            )
+        )
+    return response
+
+
+@router.get(
+    "/threadpool",
+    description="Usage of the worker threads that run sync routes and dependencies",
+)
+async def get_threadpool_status(current_user: CurrentUser) -> ThreadpoolStatusResponse:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Admin access is required.")
+
+    # Only readable from the event loop, hence the async route
+    statistics = to_thread.current_default_thread_limiter().statistics()
+    return ThreadpoolStatusResponse(
+        total_tokens=int(statistics.total_tokens),
+        borrowed_tokens=statistics.borrowed_tokens,
+        waiting_tasks=statistics.tasks_waiting,
+    )
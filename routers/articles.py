@@ -1,63 +1,215 @@
+import asyncio
 import logging
+import os
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session, select
 
-from models.article_models import Article
+from models.article_models import (ADVANCED, BEGINNER, Article, ArticleContent,
+                                   ArticleVocabulary)
+from schemas.article_schema import (ArticleFeedResponse, ArticleReadRequest,
+                                    ArticleReadResponse, ArticleRequest,
+                                    ArticleResponse, ArticleSummaryResponse,
+                                    ArticleVocabularyResponse)
 from services import sqlite_service
+from services.article_content_service import ArticleContentService
+from services.article_feed_service import ArticleFeedService
+from services.job_metrics_service import SUCCESS, TIMEOUT, job_metrics
 from services.load_articles_service import LoadArticlesService
+from services.readability_service import ReadabilityService
 from services.sqlite_service import engine
+from services.vocabulary_service import VocabularyService
+from utils.cursor import InvalidCursorError
 from utils.dependencies import CurrentUser
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+LOAD_CONTENT_TIMEOUT = float(os.getenv("ARTICLE_LOAD_CONTENT_TIMEOUT", "3"))
+LOAD_ARTICLES_JOB = "load_articles"
+INGESTION_RUN_TIMEOUT = float(os.getenv("INGESTION_RUN_TIMEOUT", "600"))
+
 
 @router.post("/create")
 def create_article(
     current_user: CurrentUser,
-    article: Article,
+    article_args: ArticleRequest,
     session: sqlite_service.SessionDep,
-) -> Article:
-    article.author_id = current_user.uuid
+) -> ArticleResponse:
+    article = Article(
+        title=article_args.title,
+        content_url=article_args.content_url,
+        author_id=current_user.uuid,
+    )
+    ReadabilityService().apply(article, article_args.content)
     session.add(article)
+    content_service = ArticleContentService()
+    content_service.set_content(session, article.id, article_args.content)
     session.commit()
     session.refresh(article)
-    return article
+    return content_service.to_response(article, article_args.content)
 
 
 @router.put("/{article_id}/update")
 def update_article(
     current_user: CurrentUser,
     article_id: str,
-    article_args: Article,
+    article_args: ArticleRequest,
     session: sqlite_service.SessionDep,
-) -> Article:
+) -> ArticleResponse:
     article = session.get(Article, UUID(article_id))
     if not article or article.author_id != current_user.uuid:
         raise HTTPException(status_code=404, detail="Article not found")
 
     article.title = article_args.title
-    article.content = article_args.content
+    ReadabilityService().apply(article, article_args.content)
+    content_service = ArticleContentService()
+    content_service.set_content(session, article.id, article_args.content)
     session.commit()
     session.refresh(article)
-    return article
+    return content_service.to_response(article, article_args.content)
 
 
-@router.get("/")
+@router.get(
+    "/",
+    description=(
+        "List articles. Use view=summary to skip the article content and "
+        "difficulty (1 beginner, 2 intermediate, 3 advanced) to filter by level"
+    ),
+)
 def get_articles(
     current_user: CurrentUser,
     session: sqlite_service.SessionDep,
-) -> list[Article]:
+    view: Literal["full", "summary"] = Query(default="full"),
+    difficulty: int | None = Query(default=None, ge=BEGINNER, le=ADVANCED),
+) -> list[ArticleResponse] | list[ArticleSummaryResponse]:
+    visible = (Article.author_id == current_user.uuid) | (Article.author_id == None)
+    if difficulty is not None:
+        visible = visible & (Article.difficulty == difficulty)
+
+    if view == "summary":
+        rows = session.exec(
+            select(
+                Article.id,
+                Article.title,
+                Article.content_url,
+                Article.created_at,
+                Article.difficulty,
+                Article.reading_grade,
+            )
+            .where(visible)
+            .offset(0)
+            .limit(100)
+        ).all()
+        return [ArticleSummaryResponse.model_validate(row._mapping) for row in rows]
+
     articles = session.exec(
         select(Article)
-        .where((Article.author_id == current_user.uuid) | (Article.author_id == None))
+        .where(visible)
         .offset(0)
         .limit(100)
     ).all()
-    return articles
+    content_service = ArticleContentService()
+    contents = content_service.get_contents(
+        session, [article.id for article in articles]
+    )
+    return [
+        content_service.to_response(article, contents.get(article.id, ""))
+        for article in articles
+    ]
+
+
+@router.get(
+    "/unread",
+    description="Articles the user has not read yet, newest first",
+)
+def get_unread_articles(
+    current_user: CurrentUser,
+    session: sqlite_service.SessionDep,
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> ArticleFeedResponse:
+    try:
+        return ArticleFeedService().unread(
+            session, current_user.uuid, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.post(
+    "/read",
+    description="Record a batch of read events",
+)
+def record_read_articles(
+    current_user: CurrentUser,
+    read_request: ArticleReadRequest,
+    session: sqlite_service.SessionDep,
+) -> ArticleReadResponse:
+    recorded = ArticleFeedService().record_reads(
+        session, current_user.uuid, read_request.events
+    )
+    session.commit()
+    return ArticleReadResponse(recorded=recorded)
+
+
+@router.get("/{article_id}")
+def get_article(
+    current_user: CurrentUser,
+    article_id: str,
+    session: sqlite_service.SessionDep,
+) -> ArticleResponse:
+    article = session.get(Article, UUID(article_id))
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    article_has_author = article.author_id is not None
+    if article_has_author and article.author_id != current_user.uuid:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    content_service = ArticleContentService()
+    content = content_service.get_content(session, article.id)
+    return content_service.to_response(article, content)
+
+
+@router.get(
+    "/{article_id}/vocabulary",
+    description="Words of the article that are new or already in the user's cards",
+)
+def get_article_vocabulary(
+    current_user: CurrentUser,
+    article_id: str,
+    session: sqlite_service.SessionDep,
+) -> ArticleVocabularyResponse:
+    article = session.get(Article, UUID(article_id))
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    article_has_author = article.author_id is not None
+    if article_has_author and article.author_id != current_user.uuid:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    vocabulary_service = VocabularyService()
+    article_vocabulary = session.get(ArticleVocabulary, article.id)
+    if not article_vocabulary:
+        # Articles stored before the vocabulary index existed
+        content = ArticleContentService().get_content(session, article.id)
+        article_vocabulary = vocabulary_service.index_article(session, article.id, content)
+        session.commit()
+
+    new_words, known_words = vocabulary_service.article_overlap(
+        session, current_user.uuid, article_vocabulary
+    )
+    return ArticleVocabularyResponse(
+        article_id=article.id,
+        word_count=article_vocabulary.word_count,
+        new_words=new_words,
+        known_words=known_words,
+    )
 
 
 @router.delete("/{article_id}/delete")
@@ -68,33 +220,78 @@ def delete_article(
     if not article or article.author_id != current_user.uuid:
         raise HTTPException(status_code=404, detail="Article not found")
 
+    ArticleContentService().delete_content(session, article.id)
+    ArticleFeedService().remove_article(session, article.id)
     session.delete(article)
     session.commit()
     return Response(status_code=204)
 
 
-async def load_articles():
+def load_articles():
     logger.info("Loading latest articles...")
+    run = job_metrics.start(LOAD_ARTICLES_JOB)
+
+    try:
+        with Session(engine) as session:
+            service = LoadArticlesService()
+            service.load_latest(session=session, run=run, timeout=INGESTION_RUN_TIMEOUT)
+    except Exception as e:
+        logger.exception("Error loading latest articles")
+        job_metrics.fail(run, e)
+        return
+
+    job_metrics.finish(run, TIMEOUT if run.timed_out else SUCCESS)
+
 
+def get_article_with_content(
+    article_id: UUID, user_id: UUID
+) -> tuple[Article | None, ArticleContent | None]:
+    """
+    Reads the article visible to the user and its stored content. Called
+    through the threadpool, so the async route never queries on the loop.
+    """
     with Session(engine) as session:
-        service = LoadArticlesService()
-        service.load_latest(session=session)
+        article = session.get(Article, article_id)
+        if not article or article.author_id not in (None, user_id):
+            return None, None
+        return article, session.get(ArticleContent, article.id)
 
 
-@router.post("/{article_id}/load_content")
-def load_article_content(
+@router.post(
+    "/{article_id}/load_content",
+    description="Load the article content, scraping it again only when stale",
+)
+async def load_article_content(
     current_user: CurrentUser,
     article_id: str,
-    session: sqlite_service.SessionDep,
-) -> Article:
-    article = session.get(Article, UUID(article_id))
+) -> ArticleResponse:
+    article, stored = await run_in_threadpool(
+        get_article_with_content, UUID(article_id), current_user.uuid
+    )
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    article_has_author = article.author_id is not None
-    if article_has_author and article.author_id != current_user.uuid:
-        raise HTTPException(status_code=404, detail="Article not found")
+    content_service = ArticleContentService()
+    if content_service.is_fresh(stored):
+        return content_service.to_response(article, content_service.decompress(stored))
+
+    flight = LoadArticlesService().load_article_content_once(
+        article.id, article.content_url
+    )
+    try:
+        # Without stored content there is nothing to fall back to, so wait
+        # for the scrape; otherwise serve the stale copy if it is slow.
+        content = await asyncio.wait_for(
+            asyncio.shield(asyncio.wrap_future(flight)),
+            timeout=LOAD_CONTENT_TIMEOUT if stored else None,
+        )
+    except asyncio.TimeoutError:
+        logger.info(f"Serving stale content while refreshing article {article.id}")
+        content = content_service.decompress(stored)
+    except Exception as e:
+        if not stored:
+            raise
+        logger.error(f"Error refreshing article {article.id}: {e}")
+        content = content_service.decompress(stored)
 
-    service = LoadArticlesService()
-    service.load_article_content(article, session=session)
-    return article
+    return content_service.to_response(article, content)
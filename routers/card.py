@@ -8,6 +8,7 @@ from models.card_models import Card, CardReviewLog
 from schemas.card_schema import (CardResponse, CardReviewLogResponse,
                                  CardReviewUpdate, CardUpdateRequest)
 from services import sqlite_service
+from services.vocabulary_service import VocabularyService
 from utils.dependencies import CurrentUser
 
 router = APIRouter()
@@ -52,6 +53,7 @@ def create_card(
 ) -> CardResponse:
     card.author_id = current_user.uuid
     session.add(card)
+    VocabularyService().index_cards(session, [card])
     session.commit()
     session.refresh(card)
     return card
@@ -67,6 +69,7 @@ def create_all_cards(
         card.author_id = current_user.uuid
 
     session.add_all(cards)
+    VocabularyService().index_cards(session, cards)
     session.commit()
     for card in cards:
         session.refresh(card)
@@ -86,6 +89,7 @@ def update_card(
         raise HTTPException(status_code=404, detail="Card not found")
     if card_arg.front:
         card.front = card_arg.front
+        VocabularyService().index_cards(session, [card])
     if card_arg.back:
         card.back = card_arg.back
     if card_arg.appears_count:
@@ -141,6 +145,8 @@ def delete_card(
     for review in card.reviews:
         session.delete(review)
 
+    VocabularyService().remove_card(session, card.id)
+
     session.delete(card)
     session.commit()
 
@@ -1,17 +1,42 @@
+import asyncio
+import logging
+from datetime import datetime
 from uuid import UUID
-from fastapi import APIRouter, HTTPException
+
+import httpx
+import openai
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import selectinload
-from sqlmodel import select
+from sqlmodel import Session, select
 
-from models.chat_models import Chat, ChatMessage
+from models.chat_models import Chat, ChatMessage, MessageRole
 from schemas.chat_schema import ChatMessageRequest, ChatWithMessagesResponse, CreateChatRequest, MessageResponse
 from services import sqlite_service, ai_service
+from services.ai_limiter_service import ai_limiter
+from services.chat_context_service import (MESSAGE_OVERHEAD_TOKENS, ChatContext,
+                                           ChatContextService)
+from services.chat_message_service import ChatMessageService
+from services.message_writer_service import message_writer
+from services.prompt_template_service import PromptTemplateService
+from services.sqlite_service import engine
 
+from utils.cursor import InvalidCursorError
 from utils.dependencies import CurrentUser
+from utils.tokens import count_tokens
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Chats with a summary update in flight, so turns don't start duplicates
+summarizing_chats: set[UUID] = set()
+# Streamed turns still reading from the model, referenced so they finish
+# even after their client is gone
+streaming_turns: set[asyncio.Task] = set()
+# Ends a streamed reply the model failed to finish, the status code is
+# already sent by then
+STREAM_ERROR_MARKER = "\n[error: the reply was interrupted, please try again]"
+
 
 @router.get("/")
 def get_my_chats(
@@ -27,35 +52,69 @@ def get_my_chats(
     return chats
 
 
-@router.get("/{chat_id}/messages")
+@router.get(
+    "/{chat_id}/messages",
+    description=(
+        "Chat messages, newest first. Pass next_cursor as before= to read older "
+        "messages, and include_prompt=true to also get the system prompt"
+    ),
+)
 def chat_messages(
     chat_id: str,
     current_user: CurrentUser,
     session: sqlite_service.SessionDep,
+    before: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    include_prompt: bool = Query(default=False),
 ) -> ChatWithMessagesResponse:
     if not current_user.has_ai_access:
         raise HTTPException(status_code=403, detail="AI access is required to view chats.")
-    
+
     chat = session.exec(
         select(Chat)
-        .options(selectinload(Chat.messages))
         .filter(Chat.id == UUID(chat_id))
         .filter(Chat.author_id == current_user.uuid)
     ).first()
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
 
-    return chat
+    try:
+        messages, next_cursor = ChatMessageService().page(
+            session,
+            chat.id,
+            before=before,
+            limit=limit,
+            include_prompt=include_prompt,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    prompt = None
+    if include_prompt and chat.prompt_template_id is not None:
+        prompt = PromptTemplateService().prompt_message(session, chat).content
+
+    return ChatWithMessagesResponse(
+        id=chat.id,
+        title=chat.title,
+        created_at=chat.created_at,
+        messages=[MessageResponse.model_validate(message) for message in messages],
+        next_cursor=next_cursor,
+        prompt=prompt,
+    )
 
 
 @router.post("/")
 def create_chat(
     current_user: CurrentUser,
     session: sqlite_service.SessionDep,
+    ai: ai_service.AIServiceDep,
     chat_data: CreateChatRequest,
 ) -> Chat:
     if not current_user.has_ai_access:
         raise HTTPException(status_code=403, detail="AI access is required to view chats.")
 
-    chat = ai_service.AIService().initialize_chat(current_user.uuid, chat_data)
+    template_id = PromptTemplateService().current_id(session)
+    chat = ai.initialize_chat(current_user.uuid, chat_data, template_id)
     session.add(chat)
     session.commit()
     session.refresh(chat)
@@ -63,65 +122,224 @@ def create_chat(
     return chat
 
 
+def get_chat_context(
+    chat_id: str, user_id: UUID, user_message_content: str
+) -> ChatContext | None:
+    """
+    Builds the prompt context in its own session. The async routes call it
+    through the threadpool, so no query runs on the event loop and no
+    connection is held while the model is answering.
+    """
+    context_service = ChatContextService()
+    with Session(engine) as session:
+        loaded = context_service.load(session, UUID(chat_id), user_id)
+        if not loaded:
+            return None
+
+        chat, messages, overflow_tokens = loaded
+        return context_service.build(
+            chat,
+            messages,
+            reserved_tokens=count_tokens(user_message_content) + MESSAGE_OVERHEAD_TOKENS,
+            overflow_tokens=overflow_tokens,
+        )
+
+
+def read_unsummarized(chat_id: UUID) -> tuple[Chat, list[dict], datetime] | None:
+    """
+    The chat, the messages that fell out of its context window and are not
+    summarized yet, oldest first, and the creation time of the last of them.
+    Runs in a worker thread.
+    """
+    context_service = ChatContextService()
+    with Session(engine) as session:
+        loaded = context_service.load(session, chat_id)
+        if not loaded:
+            return None
+
+        chat, messages, overflow_tokens = loaded
+        context = context_service.build(chat, messages, overflow_tokens=overflow_tokens)
+        unsummarized = context_service.load_unsummarized(session, chat, context.window_start)
+        if not unsummarized:
+            return None
+
+        new_messages = [
+            {"role": message.role, "content": message.content}
+            for message in unsummarized
+        ]
+        return chat, new_messages, unsummarized[-1].created_at
+
+
+def write_summary(chat_id: UUID, summary: str, summary_until: datetime):
+    with Session(engine) as session:
+        ChatContextService().save_summary(session, chat_id, summary, summary_until)
+        session.commit()
+
+
+async def refresh_chat_summary(ai: ai_service.AIService, chat_id: UUID):
+    """
+    Folds the messages that fell out of the context window into the chat
+    summary. Runs after the response, with the database work in worker
+    threads so it never blocks the event loop. The model call takes an AI
+    slot like any chat turn, and is skipped when none frees up in time.
+    """
+    if chat_id in summarizing_chats:
+        return
+
+    summarizing_chats.add(chat_id)
+    try:
+        pending = await asyncio.to_thread(read_unsummarized, chat_id)
+        if not pending:
+            return
+
+        chat, new_messages, summary_until = pending
+        try:
+            async with ai_limiter.slot(chat.author_id):
+                summary = await ai.summarize(chat.summary, new_messages, chat.author_id)
+        except HTTPException:
+            # Retried by a later turn, the messages stay unsummarized
+            logger.info(f"Skipping summary of chat {chat_id}, the AI service is busy")
+            return
+
+        await asyncio.to_thread(write_summary, chat_id, summary, summary_until)
+    except Exception:
+        logger.exception(f"Error summarizing chat {chat_id}")
+    finally:
+        summarizing_chats.discard(chat_id)
+
+
+def new_message(chat_id: str, role: str, content: str) -> ChatMessage:
+    return ChatMessage(
+        role=role,
+        content=content,
+        chat_id=UUID(chat_id),
+        token_count=count_tokens(content),
+    )
+
+
+async def stream_turn(
+    ai: ai_service.AIService,
+    chat_id: UUID,
+    user_id: UUID,
+    context: ChatContext,
+    user_message_content: str,
+    chunks: asyncio.Queue,
+):
+    """
+    Reads the model stream into `chunks` and saves the reply through the
+    write-behind queue. It runs as its own task, so the reply is saved
+    even when the client disconnects mid-stream. Releases the user's AI
+    slot, taken by the route, once the model is done.
+    """
+    full_response = ""
+    try:
+        async for chunk in ai.send_message_stream(
+            context.history, user_message_content, user_id
+        ):
+            full_response += chunk
+            chunks.put_nowait(chunk)
+    except Exception as e:
+        logger.exception(f"Error streaming reply for chat {chat_id}")
+        chunks.put_nowait(e)
+    finally:
+        ai_limiter.release(user_id)
+        chunks.put_nowait(None)
+
+    if len(full_response) > 0:
+        await message_writer.write(
+            new_message(str(chat_id), MessageRole.ASSISTANT, full_response)
+        )
+
+    if ChatContextService().needs_summary(context):
+        await refresh_chat_summary(ai, chat_id)
+
+
 @router.post("/{chat_id}/message/")
-def send_message(
+async def send_message(
     chat_id: str,
     content: ChatMessageRequest,
     current_user: CurrentUser,
-    session: sqlite_service.SessionDep,
+    ai: ai_service.AIServiceDep,
+    background_tasks: BackgroundTasks,
 ) -> MessageResponse:
     if not current_user.has_ai_access:
         raise HTTPException(status_code=403, detail="AI access is required to view chats.")
 
-    chat = session.exec(
-        select(Chat)
-        .filter(Chat.id == UUID(chat_id))
-        .filter(Chat.author_id == current_user.uuid)
-    ).first()
-
-    if not chat:
+    context = await run_in_threadpool(
+        get_chat_context, chat_id, current_user.uuid, content.message
+    )
+    if context is None:
         raise HTTPException(status_code=404, detail="Chat not found")
 
-    assistant_message = ai_service.AIService().send_message(
-        chat,
-        content.message,
+    async with ai_limiter.slot(current_user.uuid):
+        try:
+            assistant_content = await ai.send_message(
+                context.history,
+                content.message,
+                current_user.uuid,
+            )
+        except (openai.APIError, httpx.HTTPError) as e:
+            logger.exception(f"Error getting reply for chat {chat_id}")
+            raise HTTPException(status_code=502, detail="The AI service failed to answer.") from e
+
+    user_message = new_message(chat_id, MessageRole.USER, content.message)
+    assistant_message = new_message(chat_id, MessageRole.ASSISTANT, assistant_content)
+    # Saved by the write-behind queue, which commits from a worker thread
+    await asyncio.gather(
+        message_writer.write(user_message),
+        message_writer.write(assistant_message),
     )
 
-    session.add(chat)
-    session.commit()
-    session.refresh(assistant_message)
+    if ChatContextService().needs_summary(context):
+        background_tasks.add_task(refresh_chat_summary, ai, UUID(chat_id))
 
-    return assistant_message
+    return MessageResponse.model_validate(assistant_message)
 
 
 @router.post("/{chat_id}/message/stream")
-def send_message_stream(
+async def send_message_stream(
     chat_id: str,
     current_user: CurrentUser,
-    session: sqlite_service.SessionDep,
+    ai: ai_service.AIServiceDep,
     content: ChatMessageRequest,
 ) -> MessageResponse:
     if not current_user.has_ai_access:
         raise HTTPException(status_code=403, detail="AI access is required to view chats.")
 
-    chat = session.exec(
-        select(Chat)
-        .options(selectinload(Chat.messages))
-        .filter(Chat.id == UUID(chat_id))
-        .filter(Chat.author_id == current_user.uuid)
-    ).first()
-
-    if not chat:
+    context = await run_in_threadpool(
+        get_chat_context, chat_id, current_user.uuid, content.message
+    )
+    if context is None:
         raise HTTPException(status_code=404, detail="Chat not found")
 
-    def generate():
-        for chunk in ai_service.AIService().send_message_stream(
-            chat,
-            content.message,
-        ):
-            yield chunk
+    await ai_limiter.acquire(current_user.uuid)
+    try:
+        # Saved before streaming, so the turn is recorded even if the model fails
+        await message_writer.write(new_message(chat_id, MessageRole.USER, content.message))
+    except Exception:
+        ai_limiter.release(current_user.uuid)
+        raise
 
-        session.add(chat)
-        session.commit()
+    chunks: asyncio.Queue = asyncio.Queue()
+    turn = asyncio.create_task(
+        stream_turn(ai, UUID(chat_id), current_user.uuid, context, content.message, chunks)
+    )
+    streaming_turns.add(turn)
+    turn.add_done_callback(streaming_turns.discard)
+
+    # Waits for the first chunk, so a model that fails right away still
+    # gets an error status instead of an empty 200
+    first_chunk = await chunks.get()
+    if isinstance(first_chunk, Exception):
+        raise HTTPException(status_code=502, detail="The AI service failed to answer.")
+
+    async def generate():
+        chunk = first_chunk
+        while chunk is not None:
+            if isinstance(chunk, Exception):
+                yield STREAM_ERROR_MARKER
+                return
+            yield chunk
+            chunk = await chunks.get()
 
     return StreamingResponse(generate(), media_type="text/plain")
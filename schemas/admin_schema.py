@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class JobRunResponse(BaseModel):
+    job_id: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    items_fetched: int
+    items_inserted: int
+    errors: list[str] = []
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    next_run_at: Optional[datetime] = None
+    last_run: Optional[JobRunResponse] = None
+    recent_runs: list[JobRunResponse] = []
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "load_articles",
+                "next_run_at": "2025-12-07T00:00:00-03:00",
+                "last_run": {
+                    "job_id": "load_articles",
+                    "status": "success",
+                    "started_at": "2025-12-06T00:00:00",
+                    "finished_at": "2025-12-06T00:00:12",
+                    "duration_seconds": 12.3,
+                    "items_fetched": 20,
+                    "items_inserted": 4,
+                    "errors": [],
+                },
+                "recent_runs": [],
+            }
+        }
+
+
+class ThreadpoolStatusResponse(BaseModel):
+    total_tokens: int
+    borrowed_tokens: int
+    waiting_tasks: int
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "total_tokens": 40,
+                "borrowed_tokens": 3,
+                "waiting_tasks": 0,
+            }
+        }
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+
+class ArticleSummaryResponse(SQLModel):
+    id: UUID
+    title: str
+    content_url: Optional[str]
+    created_at: Optional[datetime]
+    difficulty: Optional[int] = None
+    reading_grade: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ArticleRequest(SQLModel):
+    title: str = ""
+    content_url: Optional[str] = ""
+    content: str = ""
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "title": "My article",
+                "content_url": "https://example.com/my-article",
+                "content": "Article content in markdown",
+            }
+        }
+
+
+class ArticleResponse(SQLModel):
+    id: UUID
+    content_url: Optional[str]
+    title: str
+    content: str = ""
+    created_at: Optional[datetime]
+    author_id: Optional[UUID]
+    difficulty: Optional[int] = None
+    reading_grade: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ArticleReadEvent(SQLModel):
+    article_id: UUID
+    readed_at: Optional[datetime] = None
+
+
+class ArticleReadRequest(SQLModel):
+    events: list[ArticleReadEvent]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "events": [
+                    {
+                        "article_id": "550e8400-e29b-41d4-a716-446655440000",
+                        "readed_at": "2025-12-06T12:00:00",
+                    }
+                ]
+            }
+        }
+
+
+class ArticleReadResponse(SQLModel):
+    recorded: int
+
+
+class ArticleFeedResponse(SQLModel):
+    articles: list[ArticleSummaryResponse] = []
+    next_cursor: Optional[str] = None
+
+
+class ArticleVocabularyResponse(SQLModel):
+    article_id: UUID
+    word_count: int
+    new_words: list[str] = []
+    known_words: list[str] = []
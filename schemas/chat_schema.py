@@ -6,11 +6,13 @@ from sqlmodel import SQLModel
 
 class CreateChatRequest(BaseModel):
     title: str
+    theme: str | None = None
 
     class Config:
         json_schema_extra = {
             "example": {
                 "title": "My New Chat",
+                "theme": "ordering food at a restaurant",
             }
         }
 
@@ -30,7 +32,8 @@ class MessageResponse(SQLModel):
     id: UUID
     role: str
     content: str
-    created_at: datetime
+    # Missing on legacy messages
+    created_at: datetime | None
 
     class Config:
         orm_mode = True
@@ -41,6 +44,9 @@ class ChatWithMessagesResponse(SQLModel):
     title: str
     created_at: datetime
     messages: list[MessageResponse] = []
+    next_cursor: str | None = None
+    # Rendered system prompt, only when requested with include_prompt
+    prompt: str | None = None
 
     class Config:
         orm_mode = True
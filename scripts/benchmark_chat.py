@@ -0,0 +1,154 @@
+"""
+Load test for the chat routes.
+
+Drives POST /chat/{id}/message/ and /chat/{id}/message/stream with
+concurrent clients against a running API and reports throughput, time to
+first byte, latency and how saturated the sync threadpool got, sampled
+from GET /admin/threadpool while the load runs.
+
+Each client is its own benchmark user with its own chat, so the per-user
+AI limit does not serialize the load. The users are signed up through the
+API and then granted AI and admin access directly in the local database,
+so run it against a local instance using the mock model server. Requests
+beyond AI_MAX_CONCURRENCY wait for a slot or get a 503, so raise it to
+at least the benchmark concurrency to measure the chat path itself:
+
+    python -m scripts.mock_openai_server --port 8001
+    AI_BASE_URL=http://localhost:8001/v1 AI_MAX_CONCURRENCY=50 fastapi run main.py
+    python -m scripts.benchmark_chat --requests 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+from sqlmodel import Session, select
+
+from models.user_models import User
+from services.sqlite_service import engine
+
+SAMPLE_INTERVAL = 0.05
+
+
+async def create_user(client: httpx.AsyncClient) -> dict:
+    name = f"bench-{uuid.uuid4().hex[:8]}"
+    res = await client.post(
+        "/auth/signup",
+        json={"email": f"{name}@example.com", "password": "benchmark", "username": name, "name": name},
+    )
+    res.raise_for_status()
+
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.username == name)).one()
+        user.has_ai_access = True
+        user.is_superuser = True
+        session.add(user)
+        session.commit()
+
+    return {"Authorization": f"Bearer {res.json()['session']['access_token']}"}
+
+
+async def send(client: httpx.AsyncClient, headers: dict, chat_id: str, stream: bool) -> tuple[float, float]:
+    """
+    Returns (time to first byte, total time) of one message.
+    """
+    path = f"/chat/{chat_id}/message/stream" if stream else f"/chat/{chat_id}/message/"
+    start = time.perf_counter()
+    first_byte = None
+    async with client.stream("POST", path, json={"message": "I go to the market yesterday."}, headers=headers) as res:
+        res.raise_for_status()
+        async for _ in res.aiter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+    return first_byte or 0.0, time.perf_counter() - start
+
+
+async def sample_threadpool(client: httpx.AsyncClient, headers: dict, samples: list, done: asyncio.Event):
+    while not done.is_set():
+        res = await client.get("/admin/threadpool", headers=headers)
+        if res.status_code == 200:
+            samples.append(res.json())
+        await asyncio.sleep(SAMPLE_INTERVAL)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(args, stream: bool):
+    limits = httpx.Limits(max_connections=args.concurrency + 5)
+    async with httpx.AsyncClient(base_url=args.api_url, timeout=args.timeout, limits=limits) as client:
+        # One user and chat per client, created one at a time so the setup
+        # is not part of the load
+        clients = []
+        for i in range(args.concurrency):
+            headers = await create_user(client)
+            res = await client.post("/chat/", json={"title": f"Benchmark {i}"}, headers=headers)
+            res.raise_for_status()
+            clients.append((headers, res.json()["id"]))
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(i)
+
+        results, errors = [], []
+
+        async def worker(headers: dict, chat_id: str):
+            while not queue.empty():
+                queue.get_nowait()
+                try:
+                    results.append(await send(client, headers, chat_id, stream))
+                except Exception as e:
+                    errors.append(repr(e))
+
+        samples: list[dict] = []
+        done = asyncio.Event()
+        sampler = asyncio.create_task(sample_threadpool(client, clients[0][0], samples, done))
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker(headers, chat_id) for headers, chat_id in clients])
+        elapsed = time.perf_counter() - start
+        done.set()
+        await sampler
+
+    name = "stream" if stream else "message"
+    print(f"\n/{name}: {len(results)} ok, {len(errors)} failed in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} req/s, concurrency {args.concurrency})")
+    if results:
+        ttfb = [result[0] * 1000 for result in results]
+        total = [result[1] * 1000 for result in results]
+        print(f"{'':12} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        print(f"{'first byte':12} {statistics.median(ttfb):9.0f} {percentile(ttfb, 0.95):9.0f} {max(ttfb):9.0f}")
+        print(f"{'total':12} {statistics.median(total):9.0f} {percentile(total, 0.95):9.0f} {max(total):9.0f}")
+    if samples:
+        print(
+            f"threadpool: max {max(sample['borrowed_tokens'] for sample in samples)}"
+            f"/{samples[0]['total_tokens']} threads busy, "
+            f"max {max(sample['waiting_tasks'] for sample in samples)} tasks waiting "
+            f"({len(samples)} samples)"
+        )
+    for error in sorted(set(errors))[:5]:
+        print(f"error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mode", choices=["message", "stream", "both"], default="both")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    if args.mode in ("message", "both"):
+        asyncio.run(run(args, stream=False))
+    if args.mode in ("stream", "both"):
+        asyncio.run(run(args, stream=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Correctness corpus and throughput benchmark for utils.markdown.
+
+The corpus checks the converter output for the markup we get from article
+sources. The benchmark compares the converter with the previous
+`descendants` walk, excluding HTML parsing time, on synthetic nested documents and, when present, on the
+TechCrunch post fixtures saved by scripts/benchmark_techcrunch_parsing.py.
+
+Run from the project root:
+
+    python -m scripts.benchmark_markdown
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from bs4 import BeautifulSoup, Tag
+
+from utils.markdown import markdown_converter
+
+POSTS_DIR = os.path.join(os.path.dirname(__file__), "data", "techcrunch", "posts")
+
+CORPUS: list[tuple[str, str]] = [
+    ("<p>Hello world</p>", "Hello world"),
+    ("<h1>Title</h1><p>Text</p>", "# Title\n\nText"),
+    ("<h2>A</h2><h3>B</h3><h5>C</h5>", "## A\n\n### B\n\n#### C"),
+    (
+        '<p>Read <a href="https://a.com">the <strong>docs</strong></a> now.</p>',
+        "Read [the **docs**](https://a.com) now.",
+    ),
+    ("<p>Some <em>italic</em>, <b>bold</b> and <code>x = 1</code>.</p>",
+     "Some *italic*, **bold** and `x = 1`."),
+    ("<p>A <strong> spaced </strong> word</p>", "A **spaced** word"),
+    ("<ul><li>one</li><li>two <i>2</i></li></ul>", "- one\n- two *2*"),
+    ("<ol><li>first</li><li>second</li></ol>", "1. first\n2. second"),
+    ("<p>line<br>break</p>", "line\nbreak"),
+    ("<p>  lots \n of\t whitespace  </p>", "lots of whitespace"),
+    ('<p>no <a href="">link</a> here</p>', "no link here"),
+    ('<p><a href="https://a.com"><img src="x.png"></a>Text</p>', "Text"),
+    ("<p>Keep</p><script>var x;</script><style>p {}</style><p>Going</p>", "Keep\n\nGoing"),
+    ("<p>visible<!-- hidden --></p>", "visible"),
+    ("<div><p>Nested</p><div><p>Deeper</p></div></div>", "Nested\n\nDeeper"),
+    ("<pre>def f():\n    return 1</pre>", "```\ndef f():\n    return 1\n```"),
+    ("<p>Tom &amp; Jerry</p>", "Tom & Jerry"),
+    ("<h2></h2><p></p><p>Only</p>", "Only"),
+]
+
+
+def legacy_markdown(content_tag: Tag) -> str:
+    markdown_content = []
+    for element in content_tag.descendants:
+        if element.name == "h1":
+            markdown_content.append(f"\n# {element.get_text(strip=True)}\n")
+        elif element.name == "h2":
+            markdown_content.append(f"\n## {element.get_text(strip=True)}\n")
+        elif element.name == "h3":
+            markdown_content.append(f"\n### {element.get_text(strip=True)}\n")
+        elif element.name in ("h4", "h5", "h6"):
+            markdown_content.append(f"\n#### {element.get_text(strip=True)}\n")
+        elif element.name == "p":
+            text = element.get_text(strip=True)
+            if text:
+                markdown_content.append(f"{text}\n\n")
+        elif element.name == "a" and element.get("href"):
+            markdown_content.append(f"[{element.get_text(strip=True)}]({element['href']})")
+        elif element.name in ("strong", "b"):
+            markdown_content.append(f"**{element.get_text(strip=True)}**")
+        elif element.name in ("em", "i"):
+            markdown_content.append(f"*{element.get_text(strip=True)}*")
+        elif element.name == "li":
+            markdown_content.append(f"- {element.get_text(strip=True)}\n")
+    return "".join(markdown_content).strip()
+
+
+def nested_document(paragraphs: int, depth: int) -> str:
+    inline = "word"
+    for level in range(depth):
+        tag = ("strong", "em", "a")[level % 3]
+        href = ' href="https://example.com"' if tag == "a" else ""
+        inline = f"<{tag}{href}>some text {inline} more text</{tag}>"
+    return "".join(f"<p>Paragraph {i} {inline}</p>" for i in range(paragraphs))
+
+
+def check_corpus() -> int:
+    failures = 0
+    for html, expected in CORPUS:
+        result = markdown_converter.convert(html)
+        if result != expected:
+            failures += 1
+            print(f"FAIL {html!r}\n  expected {expected!r}\n  got      {result!r}")
+    print(f"Corpus: {len(CORPUS) - failures}/{len(CORPUS)} passed")
+    return failures
+
+
+def throughput(convert, documents: list[str | bytes], iterations: int) -> float:
+    # Parse up front so only the conversion itself is measured
+    soups = [BeautifulSoup(document, "html.parser") for document in documents]
+    size = sum(len(document) for document in documents) * iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for soup in soups:
+            convert(soup)
+    return size / (time.perf_counter() - start) / 1024 / 1024
+
+
+def benchmark(iterations: int):
+    cases: dict[str, list[str | bytes]] = {
+        f"nested depth {depth}": [nested_document(50, depth)] for depth in (1, 4, 8)
+    }
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(POSTS_DIR, "*.html"))):
+        with open(path, "rb") as file:
+            fixtures.append(file.read())
+    if fixtures:
+        cases["techcrunch posts"] = fixtures
+
+    print(f"\n{'documents':24} {'legacy MB/s':>12} {'single pass MB/s':>17}")
+    for name, documents in cases.items():
+        legacy = throughput(legacy_markdown, documents, iterations)
+        single_pass = throughput(markdown_converter.convert_tag, documents, iterations)
+        print(f"{name:24} {legacy:12.2f} {single_pass:17.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    failures = check_corpus()
+    benchmark(args.iterations)
+    if failures:
+        raise SystemExit(f"{failures} corpus case(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark for the TechCrunch HTML parsing.
+
+Compares the previous full-tree parsing with the targeted parsing used by
+TechCrunchService (SoupStrainer, plus lxml with HTML_PARSER=lxml) over saved
+HTML fixtures, checking that both produce identical results and reporting
+the parse time and the peak memory of each one.
+
+Run from the project root:
+
+    # Save fixtures once (listing page + some posts)
+    python -m scripts.benchmark_techcrunch_parsing --record 10
+
+    # Benchmark offline
+    python -m scripts.benchmark_techcrunch_parsing
+    HTML_PARSER=lxml python -m scripts.benchmark_techcrunch_parsing
+"""
+
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+
+import requests
+from bs4 import BeautifulSoup
+
+from services.techcrunch_service import HTML_PARSER, TechCrunchService
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "data", "techcrunch")
+LATEST_DIR = os.path.join(FIXTURES_DIR, "latest")
+POSTS_DIR = os.path.join(FIXTURES_DIR, "posts")
+
+
+def record_fixtures(posts_count: int):
+    os.makedirs(LATEST_DIR, exist_ok=True)
+    os.makedirs(POSTS_DIR, exist_ok=True)
+    service = TechCrunchService()
+
+    res = requests.get(service.base_url + "/latest/", timeout=30)
+    res.raise_for_status()
+    with open(os.path.join(LATEST_DIR, "latest.html"), "wb") as file:
+        file.write(res.content)
+
+    for post in service.parse_latest_posts(res.content)[:posts_count]:
+        post_res = requests.get(post.url, timeout=30)
+        post_res.raise_for_status()
+        with open(os.path.join(POSTS_DIR, f"{post.slug}.html"), "wb") as file:
+            file.write(post_res.content)
+        print(f"Saved {post.url}")
+
+
+def load_fixtures(directory: str) -> dict[str, bytes]:
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "rb") as file:
+            fixtures[os.path.basename(path)] = file.read()
+    return fixtures
+
+
+def full_tree_latest_posts(service: TechCrunchService, content: bytes) -> list[dict]:
+    soup = BeautifulSoup(content, "html.parser")
+    cards = soup.find_all("div", class_="loop-card--post-type-post")
+    return [service.parse_card(card).to_json() for card in cards]
+
+
+def targeted_latest_posts(service: TechCrunchService, content: bytes) -> list[dict]:
+    return [post.to_json() for post in service.parse_latest_posts(content)]
+
+
+def full_tree_post_content(service: TechCrunchService, content: bytes) -> str:
+    soup = BeautifulSoup(content, "html.parser")
+    content_tag = soup.find("div", class_="entry-content")
+    return service.to_markdown(content_tag) if content_tag else "No Content"
+
+
+def targeted_post_content(service: TechCrunchService, content: bytes) -> str:
+    return service.parse_post_content(content)
+
+
+def measure(parse, service: TechCrunchService, content: bytes, iterations: int):
+    tracemalloc.start()
+    result = parse(service, content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(service, content)
+    elapsed = (time.perf_counter() - start) / iterations
+    return result, elapsed, peak
+
+
+def benchmark(name: str, fixtures: dict[str, bytes], baseline, candidate, iterations: int):
+    service = TechCrunchService()
+    print(f"\n{name} ({len(fixtures)} fixtures, {iterations} iterations, parser={HTML_PARSER})")
+    print(f"{'fixture':40} {'full ms':>9} {'targeted ms':>12} {'full KiB':>9} {'targeted KiB':>13}")
+
+    mismatches = 0
+    for fixture, content in fixtures.items():
+        expected, full_time, full_peak = measure(baseline, service, content, iterations)
+        result, time_, peak = measure(candidate, service, content, iterations)
+        if result != expected:
+            mismatches += 1
+            print(f"MISMATCH in {fixture}")
+
+        print(
+            f"{fixture[:40]:40} {full_time * 1000:9.2f} {time_ * 1000:12.2f} "
+            f"{full_peak / 1024:9.0f} {peak / 1024:13.0f}"
+        )
+
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--record", type=int, metavar="POSTS", help="save new fixtures first")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record)
+
+    latest = load_fixtures(LATEST_DIR)
+    posts = load_fixtures(POSTS_DIR)
+    if not latest and not posts:
+        print(f"No fixtures found in {FIXTURES_DIR}, run with --record first.")
+        return
+
+    mismatches = benchmark(
+        "Latest posts",
+        latest,
+        full_tree_latest_posts,
+        targeted_latest_posts,
+        args.iterations,
+    )
+    mismatches += benchmark(
+        "Post content",
+        posts,
+        full_tree_post_content,
+        targeted_post_content,
+        args.iterations,
+    )
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} fixture(s) produced different results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Answers POST /v1/chat/completions, streaming and non-streaming, with a
+canned reply after a configurable latency and at a configurable token
+rate, so the chat routes can be load tested without calling the real API.
+
+Run from the project root, then point the API at it:
+
+    python -m scripts.mock_openai_server --port 8001 --latency 0.5 --tokens-per-second 50
+    AI_BASE_URL=http://localhost:8001/v1 fastapi run main.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from utils.tokens import count_tokens
+
+app = FastAPI(title="Mock OpenAI")
+app.state.latency = 0.5
+app.state.tokens_per_second = 50.0
+app.state.reply_tokens = 40
+
+REPLY_WORDS = (
+    "Great job! Just a small correction: we say 'I went to the market', not "
+    "'I go to the market yesterday'. What did you buy there?"
+).split()
+
+
+def reply_tokens(count: int) -> list[str]:
+    return [REPLY_WORDS[i % len(REPLY_WORDS)] + " " for i in range(count)]
+
+
+def usage(messages: list[dict], completion: list[str]) -> dict:
+    prompt_tokens = sum(count_tokens(message.get("content") or "") for message in messages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(completion),
+        "total_tokens": prompt_tokens + len(completion),
+    }
+
+
+def chunk(completion_id: str, model: str, delta: dict, finish_reason: str | None = None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "mock")
+    messages = body.get("messages", [])
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    tokens = reply_tokens(app.state.reply_tokens)
+    interval = 1 / app.state.tokens_per_second if app.state.tokens_per_second > 0 else 0
+
+    if not body.get("stream"):
+        await asyncio.sleep(app.state.latency + interval * len(tokens))
+        return JSONResponse(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage(messages, tokens),
+            }
+        )
+
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+    async def generate():
+        await asyncio.sleep(app.state.latency)
+        yield chunk(completion_id, model, {"role": "assistant", "content": ""})
+        for token in tokens:
+            await asyncio.sleep(interval)
+            yield chunk(completion_id, model, {"content": token})
+        yield chunk(completion_id, model, {}, finish_reason="stop")
+        if include_usage:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [],
+                "usage": usage(messages, tokens),
+            }
+            yield f"data: {json.dumps(payload)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="0 sends all at once")
+    parser.add_argument("--reply-tokens", type=int, default=40)
+    args = parser.parse_args()
+
+    app.state.latency = args.latency
+    app.state.tokens_per_second = args.tokens_per_second
+    app.state.reply_tokens = args.reply_tokens
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
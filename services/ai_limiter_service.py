@@ -0,0 +1,104 @@
+import asyncio
+import math
+import os
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+from fastapi import HTTPException
+
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "20"))
+AI_MAX_CONCURRENCY_PER_USER = int(os.getenv("AI_MAX_CONCURRENCY_PER_USER", "2"))
+AI_QUEUE_TIMEOUT = float(os.getenv("AI_QUEUE_TIMEOUT", "5"))
+
+
+class AILimiter:
+    """
+    Caps the model calls in flight, per user and in total. A request waits
+    up to `queue_timeout` seconds for a slot and is then rejected: 429 when
+    the user is over their own limit, 503 when the server is at capacity.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = AI_MAX_CONCURRENCY,
+        max_per_user: int = AI_MAX_CONCURRENCY_PER_USER,
+        queue_timeout: float = AI_QUEUE_TIMEOUT,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_user = max_per_user
+        self.queue_timeout = queue_timeout
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.user_slots: dict[UUID, asyncio.Semaphore] = {}
+        # Requests holding or waiting for each user's slots, so idle users
+        # are dropped from user_slots
+        self.user_requests: dict[UUID, int] = {}
+
+    def retry_after(self) -> dict:
+        return {"Retry-After": str(max(1, math.ceil(self.queue_timeout)))}
+
+    @staticmethod
+    async def acquire_by(semaphore: asyncio.Semaphore, deadline: float) -> bool:
+        """
+        Waits for the semaphore until the loop time `deadline`. A slot taken
+        just as the timeout fires is given back, so a timeout never leaks one.
+        """
+        acquired = False
+        try:
+            async with asyncio.timeout_at(deadline):
+                await semaphore.acquire()
+                acquired = True
+        except TimeoutError:
+            if acquired:
+                semaphore.release()
+            return False
+        return True
+
+    async def acquire(self, user_id: UUID):
+        deadline = asyncio.get_running_loop().time() + self.queue_timeout
+        user_slots = self.user_slots.setdefault(user_id, asyncio.Semaphore(self.max_per_user))
+        self.user_requests[user_id] = self.user_requests.get(user_id, 0) + 1
+
+        # Also undone when the request is cancelled while waiting
+        try:
+            if not await self.acquire_by(user_slots, deadline):
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many AI requests in progress, wait for the previous ones to finish.",
+                    headers=self.retry_after(),
+                )
+
+            try:
+                if not await self.acquire_by(self.slots, deadline):
+                    raise HTTPException(
+                        status_code=503,
+                        detail="The AI service is busy, try again shortly.",
+                        headers=self.retry_after(),
+                    )
+            except BaseException:
+                user_slots.release()
+                raise
+        except BaseException:
+            self._forget(user_id)
+            raise
+
+    def release(self, user_id: UUID):
+        self.slots.release()
+        self.user_slots[user_id].release()
+        self._forget(user_id)
+
+    def _forget(self, user_id: UUID):
+        self.user_requests[user_id] -= 1
+        if self.user_requests[user_id] == 0:
+            del self.user_requests[user_id]
+            del self.user_slots[user_id]
+
+    @asynccontextmanager
+    async def slot(self, user_id: UUID):
+        await self.acquire(user_id)
+        try:
+            yield
+        finally:
+            self.release(user_id)
+
+
+ai_limiter = AILimiter()
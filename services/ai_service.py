@@ -1,114 +1,156 @@
 import os
+from typing import Annotated
 from uuid import UUID
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
+from fastapi import Depends
+from openai import AsyncOpenAI
 
-from models.chat_models import Chat, ChatMessage, MessageRole
+from models.chat_models import Chat, MessageRole
 from schemas.chat_schema import CreateChatRequest
+from services.ai_usage_service import ai_usage
+from services.http_client_service import get_async_http_client
+from services.prompt_template_service import DEFAULT_THEME
 
 load_dotenv()
 
-START_MESSAGE = """
-You are an "English Teacher" for Brazilian people, you speak English and Portuguese fluently, and you are specialized in $theme.
-The user will talk with you about this theme in English, and sometimes in Portuguese.
-Your tasks are:
-
-- If the user makes a mistake, first correct it (showing the corrected version in a natural way).
-- After correcting, answer the user to keep the conversation flowing.
-- If the user doesn't understand something, explain it in a different way or in Portuguese if the user prefers.
-- Your responses should be short and concise, like a text message.
-
-Keep the conversation natural, immersive, and engaging, like a real-life situation.
-Your main goal: help the user practice English through conversation, correction, and vocabulary expansion, without breaking the immersion of the chosen theme
+AI_MODEL = os.getenv("AI_MODEL", "gpt-5-nano")
+AI_TOKEN = os.getenv("AI_TOKEN", "")
+# Points the client at another OpenAI-compatible server, such as
+# scripts/mock_openai_server.py for load tests
+AI_BASE_URL = os.getenv("AI_BASE_URL") or None
+AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "60"))
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "10"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "2"))
+
+SUMMARY_MESSAGE = """
+You keep the summary of an English practice conversation between a user and their teacher.
+Update the current summary with the new messages. Keep the topics discussed, what the user told
+about themselves, and the mistakes the user made with their corrections.
+Answer only with the updated summary, in English, in at most 150 words.
 """
 
 
 class AIService:
 
-    def __init__(self):
-        self.model = os.getenv("AI_MODEL", "gpt-5-nano")
-        self.token = os.getenv("AI_TOKEN", "")
-        self.client = OpenAI(api_key=self.token)
-
-    def format_history(self, chat: Chat) -> list[dict]:
-        history = []
-        for message in chat.messages:
-            history.append({"role": message.role, "content": message.content})
-        return history
+    def __init__(
+        self,
+        model: str = AI_MODEL,
+        token: str = AI_TOKEN,
+        base_url: str | None = AI_BASE_URL,
+        timeout: float = AI_TIMEOUT,
+        connect_timeout: float = AI_CONNECT_TIMEOUT,
+        max_retries: int = AI_MAX_RETRIES,
+    ):
+        self.model = model
+        self.token = token
+        self.client = AsyncOpenAI(
+            api_key=self.token,
+            base_url=base_url,
+            http_client=get_async_http_client(),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            max_retries=max_retries,
+        )
 
     def initialize_chat(
         self,
         user_id: UUID,
         chat_request: CreateChatRequest,
-        theme: str = "",
+        prompt_template_id: int,
     ) -> Chat:
-        chat = Chat(title=chat_request.title, author_id=user_id)
-        system_content = (
-            START_MESSAGE.replace("$theme", theme)
-            if theme
-            else START_MESSAGE.replace("$theme", "general conversation")
-        )
-        system_message = ChatMessage(
-            role=MessageRole.DEVELOPER,
-            content=system_content,
-            chat_id=chat.id,
+        return Chat(
+            title=chat_request.title,
+            author_id=user_id,
+            prompt_template_id=prompt_template_id,
+            theme=chat_request.theme or DEFAULT_THEME,
         )
-        chat.messages.append(system_message)
-        return chat
-
-    def send_message(self, chat: Chat, user_message_content: str) -> ChatMessage:
-        user_message = ChatMessage(
-            role=MessageRole.USER,
-            content=user_message_content,
-            chat_id=chat.id,
-        )
-        chat.messages.append(user_message)
-        messages = self.format_history(chat)
-        response = self.client.chat.completions.create(
+
+    def history_with(self, history: list[dict], user_message_content: str) -> list[dict]:
+        return history + [{"role": MessageRole.USER, "content": user_message_content}]
+
+    @staticmethod
+    def record_usage(user_id: UUID | None, usage) -> None:
+        if usage is None:
+            ai_usage.record(user_id)
+        else:
+            ai_usage.record(user_id, usage.prompt_tokens, usage.completion_tokens)
+
+    async def send_message(
+        self, history: list[dict], user_message_content: str, user_id: UUID | None = None
+    ) -> str:
+        """
+        Returns the assistant reply. Works on plain history dicts so callers
+        can release their database session while the model is answering.
+        """
+        response = await self.client.chat.completions.create(
             model=self.model,
-            messages=messages,
+            messages=self.history_with(history, user_message_content),
             max_completion_tokens=500,
         )
+        self.record_usage(user_id, response.usage)
+        return response.choices[0].message.content or ""
 
-        assistant_content = response.choices[0].message.content
-        assistant_message = ChatMessage(
-            role=MessageRole.ASSISTANT,
-            content=assistant_content,
-            chat_id=chat.id,
-        )
-        chat.messages.append(assistant_message)
-
-        return assistant_message
-
-    def send_message_stream(self, chat: Chat, user_message_content: str):
-        user_message = ChatMessage(
-            role=MessageRole.USER,
-            content=user_message_content,
-            chat_id=chat.id,
+    async def send_message_stream(
+        self, history: list[dict], user_message_content: str, user_id: UUID | None = None
+    ):
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self.history_with(history, user_message_content),
+            stream=True,
+            stream_options={"include_usage": True},
         )
 
-        chat.messages.append(user_message)
-        messages = self.format_history(chat)
-        stream = self.client.chat.completions.create(
+        # Usage comes in the last chunk, a stream cut short is counted without tokens
+        usage = None
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content is not None:
+                    yield chunk.choices[0].delta.content
+        finally:
+            self.record_usage(user_id, usage)
+
+    async def summarize(
+        self, summary: str | None, messages: list[dict], user_id: UUID | None = None
+    ) -> str:
+        """
+        Folds `messages` into the running summary of the conversation.
+        """
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        response = await self.client.chat.completions.create(
             model=self.model,
-            messages=messages,
-            stream=True,
+            messages=[
+                {"role": MessageRole.DEVELOPER, "content": SUMMARY_MESSAGE},
+                {
+                    "role": MessageRole.USER,
+                    "content": f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{transcript}",
+                },
+            ],
+            max_completion_tokens=400,
         )
+        self.record_usage(user_id, response.usage)
+        return response.choices[0].message.content or summary or ""
 
-        full_response = ""
-        for chunk in stream:
-            if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                full_response += content
-                yield content
-
-        if len(full_response) > 0:
-            assistant_message = ChatMessage(
-                role=MessageRole.ASSISTANT,
-                content=full_response,
-                chat_id=chat.id,
-            )
-            chat.messages.append(assistant_message)
-        else:
-            chat.messages.remove(user_message)
+
+_service: AIService | None = None
+
+
+async def get_ai_service() -> AIService:
+    """
+    Process-wide AIService, created on first use so its client shares the
+    pooled connections of the application's async HTTP client.
+    """
+    global _service
+    if _service is None:
+        _service = AIService()
+    return _service
+
+
+def close_ai_service():
+    global _service
+    _service = None
+
+
+AIServiceDep = Annotated[AIService, Depends(get_ai_service)]
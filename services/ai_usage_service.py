@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import os
+import threading
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session
+
+from models.chat_models import AIUsage
+from services.sqlite_service import engine
+
+logger = logging.getLogger(__name__)
+
+AI_USAGE_FLUSH_SECONDS = int(os.getenv("AI_USAGE_FLUSH_SECONDS", "60"))
+
+
+class AIUsageMeter:
+    """
+    Counts model requests and tokens per user and day in memory. `flush`
+    adds the counts to the ai_usage table in one upsert, so metering costs
+    no database write per request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (user_id, day) -> [requests, prompt_tokens, completion_tokens]
+        self._counts: dict[tuple[UUID, date], list[int]] = {}
+
+    def record(self, user_id: UUID | None, prompt_tokens: int = 0, completion_tokens: int = 0):
+        if user_id is None:
+            return
+
+        key = (user_id, date.today())
+        with self._lock:
+            counts = self._counts.setdefault(key, [0, 0, 0])
+            counts[0] += 1
+            counts[1] += prompt_tokens
+            counts[2] += completion_tokens
+
+    def flush(self) -> int:
+        """
+        Returns the number of rows written. Counts are put back if the write
+        fails, to be retried on the next flush.
+        """
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return 0
+
+        statement = insert(AIUsage).values(
+            [
+                {
+                    "user_id": user_id,
+                    "day": day,
+                    "requests": requests,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                }
+                for (user_id, day), (requests, prompt_tokens, completion_tokens) in counts.items()
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "day"],
+            set_={
+                "requests": AIUsage.requests + statement.excluded.requests,
+                "prompt_tokens": AIUsage.prompt_tokens + statement.excluded.prompt_tokens,
+                "completion_tokens": AIUsage.completion_tokens + statement.excluded.completion_tokens,
+            },
+        )
+
+        try:
+            with Session(engine) as session:
+                session.execute(statement)
+                session.commit()
+        except Exception:
+            with self._lock:
+                for key, values in counts.items():
+                    current = self._counts.setdefault(key, [0, 0, 0])
+                    for i, value in enumerate(values):
+                        current[i] += value
+            raise
+
+        return len(counts)
+
+    async def flush_async(self):
+        """
+        Scheduled flush, run in a worker thread to keep the write off the
+        event loop.
+        """
+        try:
+            await asyncio.to_thread(self.flush)
+        except Exception:
+            logger.exception("Error flushing AI usage")
+
+
+ai_usage = AIUsageMeter()
@@ -0,0 +1,108 @@
+import os
+import zlib
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from models.article_models import Article, ArticleContent
+from schemas.article_schema import ArticleResponse
+from services.vocabulary_service import VocabularyService
+
+ZLIB = "zlib"
+COMPRESSION_LEVEL = 6
+CONTENT_MAX_AGE = timedelta(
+    hours=int(os.getenv("ARTICLE_CONTENT_MAX_AGE_HOURS", "24"))
+)
+
+
+class ArticleContentService:
+    """
+    Stores article bodies in the `article_content` table, compressed, so the
+    `article` rows stay narrow. Callers only ever see plain markdown strings.
+    Writing a body also refreshes the article vocabulary index.
+    """
+
+    @staticmethod
+    def compress(content: str) -> bytes:
+        return zlib.compress(content.encode("utf-8"), COMPRESSION_LEVEL)
+
+    @staticmethod
+    def decompress(article_content: ArticleContent) -> str:
+        if article_content.encoding != ZLIB:
+            raise ValueError(f"Unknown content encoding: {article_content.encoding}")
+        return zlib.decompress(article_content.body).decode("utf-8")
+
+    @staticmethod
+    def is_fresh(article_content: ArticleContent | None) -> bool:
+        if not article_content or not article_content.updated_at:
+            return False
+        return datetime.now() - article_content.updated_at < CONTENT_MAX_AGE
+
+    def get_content(self, session: Session, article_id: UUID) -> str:
+        article_content = session.get(ArticleContent, article_id)
+        if not article_content:
+            return ""
+        return self.decompress(article_content)
+
+    def get_contents(self, session: Session, article_ids: list[UUID]) -> dict[UUID, str]:
+        if not article_ids:
+            return {}
+
+        rows = session.exec(
+            select(ArticleContent).where(ArticleContent.article_id.in_(article_ids))
+        ).all()
+        return {row.article_id: self.decompress(row) for row in rows}
+
+    def set_content(self, session: Session, article_id: UUID, content: str) -> None:
+        article_content = session.get(ArticleContent, article_id)
+        if not article_content:
+            article_content = ArticleContent(article_id=article_id)
+
+        article_content.body = self.compress(content)
+        article_content.encoding = ZLIB
+        article_content.updated_at = datetime.now()
+        session.add(article_content)
+        VocabularyService().index_article(session, article_id, content)
+
+    def insert_contents(self, session: Session, contents: dict[UUID, str]) -> None:
+        """
+        Inserts the content of newly created articles in a single statement.
+        """
+        if not contents:
+            return
+
+        now = datetime.now()
+        session.execute(
+            insert(ArticleContent),
+            [
+                {
+                    "article_id": article_id,
+                    "body": self.compress(content),
+                    "encoding": ZLIB,
+                    "updated_at": now,
+                }
+                for article_id, content in contents.items()
+            ],
+        )
+        VocabularyService().index_articles(session, contents)
+
+    def delete_content(self, session: Session, article_id: UUID) -> None:
+        article_content = session.get(ArticleContent, article_id)
+        if article_content:
+            session.delete(article_content)
+        VocabularyService().remove_article(session, article_id)
+
+    @staticmethod
+    def to_response(article: Article, content: str) -> ArticleResponse:
+        return ArticleResponse(
+            id=article.id,
+            content_url=article.content_url,
+            title=article.title,
+            content=content,
+            created_at=article.created_at,
+            author_id=article.author_id,
+            difficulty=article.difficulty,
+            reading_grade=article.reading_grade,
+        )
@@ -0,0 +1,103 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, exists
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from models.article_models import Article, ArticleReaded
+from schemas.article_schema import (ArticleFeedResponse, ArticleReadEvent,
+                                    ArticleSummaryResponse)
+from utils.cursor import before_cursor, encode_cursor
+
+
+class ArticleFeedService:
+    """
+    Reading progress and the unread feed.
+
+    The feed is an anti-join against article_readed, served by its unique
+    (user_id, article_id) index, and paginated with a keyset cursor on the
+    (created_at, id) index, newest first.
+    """
+
+    @staticmethod
+    def visible_to(user_id: UUID):
+        return (Article.author_id == user_id) | (Article.author_id == None)
+
+    def record_reads(
+        self, session: Session, user_id: UUID, events: list[ArticleReadEvent]
+    ) -> int:
+        if not events:
+            return 0
+
+        readed_at = {event.article_id: event.readed_at for event in events}
+        article_ids = session.exec(
+            select(Article.id)
+            .where(Article.id.in_(list(readed_at)))
+            .where(self.visible_to(user_id))
+        ).all()
+        if not article_ids:
+            return 0
+
+        now = datetime.now()
+        result = session.execute(
+            insert(ArticleReaded)
+            .values(
+                [
+                    {
+                        "id": uuid4(),
+                        "user_id": user_id,
+                        "article_id": article_id,
+                        "readed_at": readed_at[article_id] or now,
+                    }
+                    for article_id in article_ids
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "article_id"])
+        )
+        return result.rowcount
+
+    def remove_article(self, session: Session, article_id: UUID) -> None:
+        """
+        Drops every user's reading progress of a deleted article. Does not commit.
+        """
+        session.execute(delete(ArticleReaded).where(ArticleReaded.article_id == article_id))
+
+    def unread(
+        self,
+        session: Session,
+        user_id: UUID,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> ArticleFeedResponse:
+        already_read = exists().where(
+            ArticleReaded.user_id == user_id,
+            ArticleReaded.article_id == Article.id,
+        )
+        query = (
+            select(
+                Article.id,
+                Article.title,
+                Article.content_url,
+                Article.created_at,
+                Article.difficulty,
+                Article.reading_grade,
+            )
+            .where(self.visible_to(user_id))
+            .where(~already_read)
+        )
+
+        if cursor:
+            query = query.where(before_cursor(Article.created_at, Article.id, cursor))
+
+        rows = session.exec(
+            query.order_by(Article.created_at.desc(), Article.id.desc()).limit(limit + 1)
+        ).all()
+
+        articles = [ArticleSummaryResponse.model_validate(row._mapping) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = articles[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return ArticleFeedResponse(articles=articles, next_cursor=next_cursor)
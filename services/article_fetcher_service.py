@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+from services.http_cache_service import http_cache
+from services.http_client_service import create_async_http_client
+from services.techcrunch_service import POST_CONTENT_TTL
+from utils.exceptions import CacheMissError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ArticleFetcherService:
+    """
+    Downloads many article pages concurrently during ingestion.
+
+    Concurrency is bounded globally and per host, every request has a
+    timeout, and transient failures are retried with exponential backoff.
+    Failed URLs are left out of the result instead of failing the batch.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        per_host_concurrency: int | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        backoff: float = 0.5,
+    ):
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("INGESTION_MAX_CONCURRENCY", "10")
+        )
+        self.per_host_concurrency = per_host_concurrency or int(
+            os.getenv("INGESTION_PER_HOST_CONCURRENCY", "4")
+        )
+        self.timeout = timeout or float(os.getenv("INGESTION_TIMEOUT", "30"))
+        self.retries = (
+            retries
+            if retries is not None
+            else int(os.getenv("INGESTION_RETRIES", "2"))
+        )
+        self.backoff = backoff
+        self.timed_out = False
+
+    def fetch_all(self, urls: list[str], deadline: float | None = None) -> dict[str, bytes]:
+        """
+        Fetches all URLs. With a `deadline` (a time.monotonic() value), the
+        fetches still pending when it passes are cancelled and left out.
+        """
+        if not urls:
+            return {}
+        return asyncio.run(self.fetch_all_async(urls, deadline))
+
+    async def fetch_all_async(
+        self, urls: list[str], deadline: float | None = None
+    ) -> dict[str, bytes]:
+        limiter = asyncio.Semaphore(self.max_concurrency)
+        host_limiters: dict[str, asyncio.Semaphore] = {}
+        for url in urls:
+            host = urlparse(url).netloc
+            if host not in host_limiters:
+                host_limiters[host] = asyncio.Semaphore(self.per_host_concurrency)
+
+        async with create_async_http_client() as client:
+
+            async def fetch_limited(url: str) -> bytes | None:
+                async with limiter, host_limiters[urlparse(url).netloc]:
+                    return await self.fetch(client, url)
+
+            tasks = {url: asyncio.create_task(fetch_limited(url)) for url in urls}
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if pending:
+            self.timed_out = True
+            logger.warning(f"Timed out with {len(pending)} pending fetches")
+
+        bodies = {}
+        for url, task in tasks.items():
+            if task.cancelled():
+                continue
+            if task.exception():
+                logger.error(f"Error fetching {url}: {task.exception()}")
+            elif task.result() is not None:
+                bodies[url] = task.result()
+        return bodies
+
+    async def fetch(self, client: httpx.AsyncClient, url: str) -> bytes | None:
+        for attempt in range(self.retries + 1):
+            try:
+                res = await http_cache.get_async(
+                    client, url, ttl=POST_CONTENT_TTL, timeout=self.timeout
+                )
+                if 200 <= res.status_code < 300:
+                    return res.content
+                if res.status_code not in RETRY_STATUS_CODES:
+                    logger.error(f"Got {res.status_code} fetching {url}")
+                    return None
+
+                logger.warning(f"Got {res.status_code} fetching {url}")
+            except CacheMissError as e:
+                logger.error(str(e))
+                return None
+            except httpx.TransportError as e:
+                logger.warning(f"Error fetching {url}: {e}")
+
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+        logger.error(f"Giving up on {url} after {self.retries + 1} attempts")
+        return None
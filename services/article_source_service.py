@@ -0,0 +1,234 @@
+import logging
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from services import tabnews_service, techcrunch_service
+from services.http_cache_service import http_cache
+from services.parsing_pool_service import parsing_pool
+from services.tabnews_service import TabNewsService
+from services.techcrunch_service import TechCrunchService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ArticleRecord:
+    """
+    An article as returned by any source, before it is stored.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        title: str,
+        url: str,
+        published_at: str = "",
+        owner_username: str = "",
+        content: str | None = None,
+    ):
+        self.source = source
+        self.title = title
+        self.url = url
+        self.published_at = published_at
+        self.owner_username = owner_username
+        self.content = content
+
+    def to_json(self) -> dict:
+        return {
+            "source": self.source,
+            "title": self.title,
+            "url": self.url,
+            "published_at": self.published_at,
+            "owner_username": self.owner_username,
+            "content": self.content,
+        }
+
+
+class ArticleSource(ABC):
+    """
+    Base class of the article sources used by the ingestion.
+
+    A source lists its latest articles as ArticleRecords and knows where to
+    download the body of one of its articles and how to parse it. Parsing
+    only takes raw bytes, so it can run in the parsing process pool.
+    """
+
+    name = ""
+    hosts: tuple[str, ...] = ()
+    listing_ttl = 5 * 60
+    content_ttl = 24 * 60 * 60
+
+    def __init__(self, pages: int = 1, limit: int | None = None):
+        self.pages = pages
+        self.limit = limit
+
+    def latest(self) -> list[ArticleRecord]:
+        records = []
+        for page in range(1, self.pages + 1):
+            page_records = self.latest_page(page)
+            records += page_records
+            if not page_records or (self.limit and len(records) >= self.limit):
+                break
+        return records[: self.limit] if self.limit else records
+
+    def latest_page(self, page: int) -> list[ArticleRecord]:
+        res = http_cache.get(self.listing_url(page), ttl=self.listing_ttl)
+        if res.status_code < 200 or res.status_code >= 300:
+            raise ConnectionRefusedError()
+
+        return parsing_pool.run(parse_listing, self.name, res.content)
+
+    @abstractmethod
+    def listing_url(self, page: int) -> str: ...
+
+    @abstractmethod
+    def parse_listing(self, content: bytes) -> list[ArticleRecord]: ...
+
+    def content_url(self, url: str) -> str:
+        return url
+
+    @abstractmethod
+    def parse_content(self, content: bytes) -> str: ...
+
+    def handles(self, url: str) -> bool:
+        return urlparse(url).netloc in self.hosts
+
+
+class TechCrunchSource(ArticleSource):
+    name = "techcrunch"
+    hosts = ("techcrunch.com", "www.techcrunch.com")
+    listing_ttl = techcrunch_service.LATEST_POSTS_TTL
+    content_ttl = techcrunch_service.POST_CONTENT_TTL
+
+    def __init__(self, pages: int = 1, limit: int | None = None):
+        super().__init__(pages, limit)
+        self.service = TechCrunchService()
+
+    def listing_url(self, page: int) -> str:
+        return self.service.latest_posts_url(page)
+
+    def parse_listing(self, content: bytes) -> list[ArticleRecord]:
+        return [
+            ArticleRecord(
+                source=self.name,
+                title=post.title,
+                url=post.url,
+                published_at=post.published_at,
+                owner_username=post.owner_username,
+            )
+            for post in self.service.parse_latest_posts(content)
+            if post.url != "No URL"
+        ]
+
+    def parse_content(self, content: bytes) -> str:
+        return self.service.parse_post_content(content)
+
+
+class TabNewsSource(ArticleSource):
+    name = "tabnews"
+    hosts = ("www.tabnews.com.br", "tabnews.com.br")
+    listing_ttl = tabnews_service.RELEVANT_POSTS_TTL
+    content_ttl = tabnews_service.POST_CONTENT_TTL
+
+    def __init__(self, pages: int = 1, limit: int | None = None):
+        super().__init__(pages, limit)
+        self.service = TabNewsService()
+
+    def listing_url(self, page: int) -> str:
+        return self.service.relevant_posts_url(page)
+
+    def parse_listing(self, content: bytes) -> list[ArticleRecord]:
+        return [
+            ArticleRecord(
+                source=self.name,
+                title=post.title,
+                url=self.service.post_url(post.owner_username, post.slug),
+                published_at=post.published_at,
+                owner_username=post.owner_username,
+            )
+            for post in self.service.parse_relevant_posts(content)
+        ]
+
+    def content_url(self, url: str) -> str:
+        return self.service.post_api_url(url)
+
+    def parse_content(self, content: bytes) -> str:
+        return self.service.parse_post_content(content)
+
+
+ARTICLE_SOURCES: dict[str, type[ArticleSource]] = {
+    TechCrunchSource.name: TechCrunchSource,
+    TabNewsSource.name: TabNewsSource,
+}
+
+
+def source_class(name: str) -> type[ArticleSource]:
+    try:
+        return ARTICLE_SOURCES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown article source {name!r}, valid sources are: {', '.join(ARTICLE_SOURCES)}"
+        ) from None
+
+
+class ArticleSourceService:
+
+    def __init__(self, source_names: list[str] | None = None):
+        if source_names is None:
+            source_names = os.getenv("ARTICLE_SOURCES", "techcrunch,tabnews").split(",")
+
+        pages = int(os.getenv("INGESTION_PAGES_PER_SOURCE", "1"))
+        limit = int(os.getenv("INGESTION_LIMIT_PER_SOURCE", "0")) or None
+        self.sources = [
+            source_class(name.strip())(pages=pages, limit=limit)
+            for name in source_names
+            if name.strip()
+        ]
+
+    def source_for_url(self, url: str) -> ArticleSource | None:
+        for source_class in ARTICLE_SOURCES.values():
+            source = source_class()
+            if source.handles(url):
+                return source
+        return None
+
+    def latest(self) -> tuple[list[ArticleRecord], dict[str, str]]:
+        """
+        Lists the latest articles of all enabled sources concurrently.
+
+        Returns the records of the sources that worked and the errors of the
+        ones that failed, so one broken source does not stop the others.
+        """
+        if not self.sources:
+            return [], {}
+
+        def latest_or_error(source: ArticleSource):
+            try:
+                return source.latest(), None
+            except Exception as e:
+                logger.error(f"Error listing articles from {source.name}: {e}")
+                return [], str(e) or type(e).__name__
+
+        with ThreadPoolExecutor(max_workers=len(self.sources)) as executor:
+            results = list(executor.map(latest_or_error, self.sources))
+
+        records = []
+        errors = {}
+        for source, (source_records, error) in zip(self.sources, results):
+            records += source_records
+            if error:
+                errors[source.name] = error
+        return records, errors
+
+
+# Module level entry points, so they can be sent to the parsing process pool
+
+
+def parse_listing(source_name: str, content: bytes) -> list[ArticleRecord]:
+    return source_class(source_name)().parse_listing(content)
+
+
+def parse_content(source_name: str, content: bytes) -> str:
+    return source_class(source_name)().parse_content(content)
@@ -0,0 +1,208 @@
+import os
+from datetime import datetime
+from uuid import UUID
+
+from sqlmodel import Session, func, select
+
+from models.chat_models import Chat, ChatMessage, MessageRole
+from services.prompt_template_service import PromptTemplateService
+from utils.tokens import count_tokens
+
+AI_CONTEXT_TOKENS = int(os.getenv("AI_CONTEXT_TOKENS", "4000"))
+AI_SUMMARY_TRIGGER_TOKENS = int(os.getenv("AI_SUMMARY_TRIGGER_TOKENS", "1000"))
+# Most recent messages read per turn, the token budget picks from these
+AI_HISTORY_MESSAGES = int(os.getenv("AI_HISTORY_MESSAGES", "50"))
+
+# Role and separators the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+PROMPT_ROLES = (MessageRole.DEVELOPER, MessageRole.SYSTEM)
+
+
+def is_prompt(message: ChatMessage) -> bool:
+    return message.role in PROMPT_ROLES
+
+
+class ChatContext:
+
+    def __init__(
+        self,
+        history: list[dict],
+        unsummarized: list[ChatMessage],
+        summary: str | None = None,
+        window_start: datetime | None = None,
+        overflow_tokens: int = 0,
+    ):
+        self.history = history
+        # Older messages left out of the window and not yet in the summary
+        self.unsummarized = unsummarized
+        self.summary = summary
+        # Creation time of the oldest message in the window
+        self.window_start = window_start
+        # Tokens of the unsummarized messages older than the loaded tail
+        self.overflow_tokens = overflow_tokens
+
+    def unsummarized_tokens(self) -> int:
+        return self.overflow_tokens + sum(
+            ChatContextService.message_tokens(message) for message in self.unsummarized
+        )
+
+
+class ChatContextService:
+    """
+    Builds the prompt for a chat turn within a token budget: the developer
+    prompt, a rolling summary of older turns and as many recent messages
+    as fit. Older turns are folded into the summary in the background.
+    """
+
+    def __init__(self, budget: int = AI_CONTEXT_TOKENS):
+        self.budget = budget
+
+    @staticmethod
+    def message_tokens(message: ChatMessage) -> int:
+        tokens = message.token_count
+        if tokens is None:
+            tokens = count_tokens(message.content)
+        return tokens + MESSAGE_OVERHEAD_TOKENS
+
+    @staticmethod
+    def summary_message(summary: str) -> dict:
+        return {"role": MessageRole.DEVELOPER, "content": SUMMARY_PREFIX + summary}
+
+    def build(
+        self,
+        chat: Chat,
+        messages: list[ChatMessage],
+        reserved_tokens: int = 0,
+        overflow_tokens: int = 0,
+    ) -> ChatContext:
+        """
+        Messages must be in chronological order. `reserved_tokens` is kept
+        free for the new user message, `overflow_tokens` are those of the
+        unsummarized messages older than `messages`, as returned by `load`.
+        """
+        prompt = [message for message in messages if is_prompt(message)]
+        turns = [message for message in messages if not is_prompt(message)]
+
+        history = [{"role": message.role, "content": message.content} for message in prompt]
+        remaining = self.budget - reserved_tokens - sum(
+            self.message_tokens(message) for message in prompt
+        )
+        if chat.summary:
+            history.append(self.summary_message(chat.summary))
+            remaining -= count_tokens(chat.summary) + MESSAGE_OVERHEAD_TOKENS
+
+        start = len(turns)
+        while start > 0 and self.message_tokens(turns[start - 1]) <= remaining:
+            remaining -= self.message_tokens(turns[start - 1])
+            start -= 1
+
+        history += [{"role": message.role, "content": message.content} for message in turns[start:]]
+        unsummarized = [
+            message
+            for message in turns[:start]
+            if chat.summary_until is None or message.created_at > chat.summary_until
+        ]
+        window_start = turns[start].created_at if start < len(turns) else None
+        return ChatContext(history, unsummarized, chat.summary, window_start, overflow_tokens)
+
+    def needs_summary(self, context: ChatContext) -> bool:
+        """
+        Summarizes once enough tokens are left out of the prompt, so the
+        extra model call happens every few turns instead of on each one.
+        """
+        return context.unsummarized_tokens() >= AI_SUMMARY_TRIGGER_TOKENS
+
+    def load(
+        self, session: Session, chat_id: UUID, user_id: UUID | None = None
+    ) -> tuple[Chat, list[ChatMessage], int] | None:
+        """
+        Reads the chat, its rendered prompt and the last AI_HISTORY_MESSAGES messages
+        not yet summarized, in chronological order, and the tokens of the
+        unsummarized messages older than those. The message queries use the
+        (chat_id, created_at) index and only cover messages since the summary.
+        """
+        query = select(Chat).filter(Chat.id == chat_id)
+        if user_id is not None:
+            query = query.filter(Chat.author_id == user_id)
+
+        chat = session.exec(query).first()
+        if not chat:
+            return None
+
+        if chat.prompt_template_id is not None:
+            prompt = [PromptTemplateService().prompt_message(session, chat)]
+        else:
+            prompt = session.exec(
+                select(ChatMessage)
+                .where(ChatMessage.chat_id == chat_id)
+                .where(ChatMessage.role.in_(PROMPT_ROLES))
+                .order_by(ChatMessage.created_at)
+            ).all()
+
+        tail_query = (
+            select(ChatMessage)
+            .where(ChatMessage.chat_id == chat_id)
+            .where(ChatMessage.role.not_in(PROMPT_ROLES))
+        )
+        if chat.summary_until is not None:
+            tail_query = tail_query.where(ChatMessage.created_at > chat.summary_until)
+        tail = session.exec(
+            tail_query.order_by(ChatMessage.created_at.desc()).limit(AI_HISTORY_MESSAGES)
+        ).all()
+
+        overflow_tokens = 0
+        if len(tail) == AI_HISTORY_MESSAGES:
+            overflow_tokens = self.overflow_tokens(session, chat, tail[-1].created_at)
+
+        return chat, list(prompt) + list(reversed(tail)), overflow_tokens
+
+    def overflow_tokens(self, session: Session, chat: Chat, tail_start: datetime) -> int:
+        query = (
+            select(
+                func.coalesce(func.sum(ChatMessage.token_count), 0),
+                func.count(ChatMessage.id),
+            )
+            .where(ChatMessage.chat_id == chat.id)
+            .where(ChatMessage.role.not_in(PROMPT_ROLES))
+            .where(ChatMessage.created_at < tail_start)
+        )
+        if chat.summary_until is not None:
+            query = query.where(ChatMessage.created_at > chat.summary_until)
+
+        tokens, count = session.exec(query).one()
+        return tokens + count * MESSAGE_OVERHEAD_TOKENS
+
+    def load_unsummarized(
+        self, session: Session, chat: Chat, window_start: datetime | None
+    ) -> list[ChatMessage]:
+        """
+        Oldest messages between the summary and the context window, which
+        may lie beyond the tail read by `load`.
+        """
+        query = (
+            select(ChatMessage)
+            .where(ChatMessage.chat_id == chat.id)
+            .where(ChatMessage.role.not_in(PROMPT_ROLES))
+        )
+        if chat.summary_until is not None:
+            query = query.where(ChatMessage.created_at > chat.summary_until)
+        if window_start is not None:
+            query = query.where(ChatMessage.created_at < window_start)
+        return session.exec(
+            query.order_by(ChatMessage.created_at).limit(AI_HISTORY_MESSAGES)
+        ).all()
+
+    def save_summary(
+        self, session: Session, chat_id: UUID, summary: str, summary_until: datetime
+    ) -> None:
+        chat = session.get(Chat, chat_id)
+        # Skip if a concurrent update already summarized further
+        if chat.summary_until is not None and chat.summary_until >= summary_until:
+            return
+
+        chat.summary = summary
+        chat.summary_until = summary_until
+        session.add(chat)
@@ -0,0 +1,40 @@
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from models.chat_models import ChatMessage
+from services.chat_context_service import PROMPT_ROLES
+from utils.cursor import before_cursor, encode_cursor
+
+
+class ChatMessageService:
+    """
+    Message history of a chat, newest first, paginated with a keyset
+    cursor served by the (chat_id, created_at) index.
+    """
+
+    def page(
+        self,
+        session: Session,
+        chat_id: UUID,
+        before: str | None = None,
+        limit: int = 20,
+        include_prompt: bool = False,
+    ) -> tuple[list[ChatMessage], str | None]:
+        query = select(ChatMessage).where(ChatMessage.chat_id == chat_id)
+        if not include_prompt:
+            query = query.where(ChatMessage.role.not_in(PROMPT_ROLES))
+
+        if before:
+            query = query.where(before_cursor(ChatMessage.created_at, ChatMessage.id, before))
+
+        messages = session.exec(
+            query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit + 1)
+        ).all()
+
+        next_cursor = None
+        if len(messages) > limit:
+            last = messages[limit - 1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return messages[:limit], next_cursor
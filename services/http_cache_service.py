@@ -0,0 +1,271 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from email.utils import formatdate
+
+import httpx
+
+from services.http_client_service import get_http_client
+from utils.exceptions import CacheMissError
+
+MODE_DEFAULT = "default"
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+STORED_HEADERS = ("etag", "last-modified", "content-type")
+
+# Stores between two checks of the cache size
+PRUNE_INTERVAL = 100
+
+
+class CachedResponse:
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        content: bytes,
+        headers: dict[str, str],
+        stored_at: float | None = None,
+        from_cache: bool = False,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.stored_at = stored_at
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpCache:
+    """
+    On-disk HTTP cache shared by the scraper services.
+
+    Entries younger than their TTL are served without touching the network.
+    Stale entries are revalidated with If-None-Match / If-Modified-Since, so
+    an unchanged page costs a 304 instead of a full download and re-parse.
+
+    HTTP_CACHE_MODE selects the behaviour:
+    - default: TTL + revalidation
+    - off: always hit the network, store nothing
+    - record: always hit the network and store every response
+    - replay: serve only from disk, never hit the network (offline fixtures)
+
+    The cache keeps at most HTTP_CACHE_MAX_ENTRIES entries, dropping the
+    least recently stored or revalidated ones first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        mode: str | None = None,
+        default_ttl: int | None = None,
+        max_entries: int | None = None,
+    ):
+        self.cache_dir = cache_dir or os.getenv("HTTP_CACHE_DIR", ".http_cache")
+        self.mode = mode or os.getenv("HTTP_CACHE_MODE", MODE_DEFAULT)
+        self.default_ttl = (
+            default_ttl
+            if default_ttl is not None
+            else int(os.getenv("HTTP_CACHE_TTL", "300"))
+        )
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "5000"))
+        )
+        self._stores = 0
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        path = self._path(url)
+        try:
+            with open(f"{path}.json", "r", encoding="utf-8") as file:
+                metadata = json.load(file)
+            with open(f"{path}.body", "rb") as file:
+                content = file.read()
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(
+            url=url,
+            status_code=metadata["status_code"],
+            content=content,
+            headers=metadata["headers"],
+            stored_at=metadata["stored_at"],
+            from_cache=True,
+        )
+
+    def store(
+        self,
+        url: str,
+        status_code: int,
+        headers: dict[str, str],
+        content: bytes,
+    ) -> CachedResponse:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._write(f"{self._path(url)}.body", content)
+
+        stored_headers = {
+            name: value
+            for name, value in ((k.lower(), v) for k, v in headers.items())
+            if name in STORED_HEADERS
+        }
+        cached = CachedResponse(url, status_code, content, stored_headers)
+        self._write_metadata(cached)
+
+        self._stores += 1
+        if self._stores % PRUNE_INTERVAL == 0:
+            self.prune()
+        return cached
+
+    def touch(self, cached: CachedResponse) -> CachedResponse:
+        body_path = f"{self._path(cached.url)}.body"
+        if not os.path.exists(body_path):
+            # Pruned since it was looked up, the body is still in memory
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write(body_path, cached.content)
+        self._write_metadata(cached)
+        return cached
+
+    def _write(self, path: str, data: bytes) -> None:
+        """
+        Writes to a temporary file first so readers never see a partial
+        file. The name is unique, so concurrent writers of the same entry
+        don't clobber each other's file before it is moved in place.
+        """
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as file:
+            file.write(data)
+        os.replace(file.name, path)
+
+    def _write_metadata(self, cached: CachedResponse) -> None:
+        cached.stored_at = time.time()
+        metadata = {
+            "url": cached.url,
+            "status_code": cached.status_code,
+            "headers": cached.headers,
+            "stored_at": cached.stored_at,
+        }
+        self._write(f"{self._path(cached.url)}.json", json.dumps(metadata).encode("utf-8"))
+
+    def prune(self) -> int:
+        """
+        Removes the entries written longest ago beyond `max_entries`.
+        Returns the number of entries removed.
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as files:
+            for file in files:
+                if file.name.endswith(".json"):
+                    try:
+                        entries.append((file.stat().st_mtime, file.path[: -len(".json")]))
+                    except OSError:
+                        continue
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+
+        entries.sort()
+        for _, path in entries[:excess]:
+            for suffix in (".json", ".body"):
+                try:
+                    os.remove(path + suffix)
+                except FileNotFoundError:
+                    pass
+        return excess
+
+    def is_fresh(self, cached: CachedResponse, ttl: int) -> bool:
+        return cached.stored_at is not None and time.time() - cached.stored_at < ttl
+
+    @staticmethod
+    def validators(cached: CachedResponse | None) -> dict[str, str]:
+        if not cached:
+            return {}
+
+        headers = {}
+        if "etag" in cached.headers:
+            headers["If-None-Match"] = cached.headers["etag"]
+        if "last-modified" in cached.headers:
+            headers["If-Modified-Since"] = cached.headers["last-modified"]
+        elif cached.stored_at is not None:
+            headers["If-Modified-Since"] = formatdate(cached.stored_at, usegmt=True)
+        return headers
+
+    def prepare(
+        self, url: str, ttl: int | None = None
+    ) -> tuple[CachedResponse | None, CachedResponse | None, dict[str, str]]:
+        """
+        Returns (response to serve without a request, cached entry, request headers).
+        """
+        if self.mode == MODE_OFF or self.mode == MODE_RECORD:
+            return None, None, {}
+
+        cached = self.lookup(url)
+        if self.mode == MODE_REPLAY:
+            if not cached:
+                raise CacheMissError(url)
+            return cached, cached, {}
+
+        if cached and self.is_fresh(cached, self.default_ttl if ttl is None else ttl):
+            return cached, cached, {}
+
+        return None, cached, self.validators(cached)
+
+    def resolve(
+        self,
+        url: str,
+        cached: CachedResponse | None,
+        status_code: int,
+        headers: dict[str, str],
+        content: bytes,
+    ) -> CachedResponse:
+        if status_code == 304:
+            if cached is None:
+                # Nothing to revalidate, the server answered a request we
+                # didn't make conditional
+                raise CacheMissError(url)
+            return self.touch(cached)
+
+        if 200 <= status_code < 300 and self.mode != MODE_OFF:
+            return self.store(url, status_code, headers, content)
+
+        return CachedResponse(url, status_code, content, dict(headers))
+
+    def get(self, url: str, ttl: int | None = None) -> CachedResponse:
+        response, cached, headers = self.prepare(url, ttl)
+        if response:
+            return response
+
+        res = get_http_client().get(url, headers=headers)
+        return self.resolve(url, cached, res.status_code, res.headers, res.content)
+
+    async def get_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        ttl: int | None = None,
+        timeout: float | None = None,
+    ) -> CachedResponse:
+        response, cached, headers = self.prepare(url, ttl)
+        if response:
+            return response
+
+        res = await client.get(
+            url,
+            headers=headers,
+            timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+        )
+        return self.resolve(url, cached, res.status_code, res.headers, res.content)
+
+
+http_cache = HttpCache()
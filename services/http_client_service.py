@@ -0,0 +1,75 @@
+import os
+import threading
+
+import httpx
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2 = os.getenv("HTTP2", "true").lower() == "true"
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+
+
+def client_options() -> dict:
+    return {
+        "http2": HTTP2,
+        "follow_redirects": True,
+        "timeout": httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Process-wide outbound HTTP client. Reusing it keeps connections (and
+    their TLS sessions) alive between calls instead of opening new ones.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(**client_options())
+    return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Outbound async client shared by code running on the application's event
+    loop, such as the chat routes. Closed on shutdown.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(**client_options())
+    return _async_client
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """
+    Async clients are bound to the event loop they are used in, so callers
+    that run their own loop create one per run with the same settings.
+    """
+    return httpx.AsyncClient(**client_options())
+
+
+def close_http_client():
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def close_async_http_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+RUNNING = "running"
+SUCCESS = "success"
+FAILED = "failed"
+TIMEOUT = "timeout"
+
+
+class JobRun:
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = RUNNING
+        self.started_at = datetime.now()
+        self.finished_at: datetime | None = None
+        self.duration_seconds: float | None = None
+        self.items_fetched = 0
+        self.items_inserted = 0
+        self.errors: list[str] = []
+        self.timed_out = False
+        self._started = time.monotonic()
+
+    def add_error(self, error: str):
+        self.errors.append(error)
+
+    def to_json(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": self.duration_seconds,
+            "items_fetched": self.items_fetched,
+            "items_inserted": self.items_inserted,
+            "errors": list(self.errors),
+        }
+
+
+class JobMetricsService:
+    """
+    Keeps the most recent runs of each scheduled job in memory.
+    """
+
+    def __init__(self, history_size: int = 20):
+        self._lock = threading.Lock()
+        self._runs: dict[str, deque[JobRun]] = {}
+        self.history_size = history_size
+
+    def start(self, job_id: str) -> JobRun:
+        run = JobRun(job_id)
+        with self._lock:
+            if job_id not in self._runs:
+                self._runs[job_id] = deque(maxlen=self.history_size)
+            self._runs[job_id].appendleft(run)
+        return run
+
+    def finish(self, run: JobRun, status: str = SUCCESS):
+        run.status = status
+        run.finished_at = datetime.now()
+        run.duration_seconds = round(time.monotonic() - run._started, 3)
+
+    def fail(self, run: JobRun, error: Exception):
+        run.add_error(str(error))
+        self.finish(run, FAILED)
+
+    def runs(self, job_id: str) -> list[JobRun]:
+        with self._lock:
+            return list(self._runs.get(job_id, []))
+
+    def job_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._runs)
+
+
+job_metrics = JobMetricsService()
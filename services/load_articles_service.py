@@ -1,54 +1,172 @@
 import logging
+import os
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from uuid import UUID, uuid4
 
-from sqlmodel import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
 
 from models.article_models import Article
-from services.sqlite_service import SessionDep
-from services.techcrunch_service import TechCrunchResponse, TechCrunchService
+from services.article_content_service import ArticleContentService
+from services.article_fetcher_service import ArticleFetcherService
+from services.article_source_service import (ArticleRecord, ArticleSourceService,
+                                             parse_content)
+from services.http_cache_service import http_cache
+from services.job_metrics_service import JobRun
+from services.sqlite_service import SessionDep, engine
+from services.parsing_pool_service import parsing_pool
+from services.readability_service import ReadabilityService
+from utils.single_flight import SingleFlight
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+INSERT_BATCH_SIZE = 500
+
+content_flights = SingleFlight(
+    max_workers=int(os.getenv("ARTICLE_CONTENT_WORKERS", "4")),
+    thread_name_prefix="article-content",
+)
+
 
 class LoadArticlesService:
 
-    def load_latest(self, session: SessionDep):
-        service = TechCrunchService()
-        responses: list[TechCrunchResponse] = service.latest_posts()
-
-        new_articles = []
-        for res in responses:
-            try:
-                existing_article = session.exec(
-                    select(Article).where(Article.content_url == res.url)
-                ).first()
-                if existing_article:
-                    logger.info(f"Article already exists: {res.url}")
-                    continue
-
-            except Exception as e:
-                logger.error(f"Error checking existing article: {e}")
-                continue
+    def load_latest(
+        self,
+        session: SessionDep,
+        run: JobRun | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        run = run or JobRun("load_latest")
 
-            session.add(
-                Article(
-                    title=res.title,
-                    content_url=res.url,
-                    content=res.content,
+        source_service = ArticleSourceService()
+        records, source_errors = source_service.latest()
+        run.items_fetched = len(records)
+        for source_name, error in source_errors.items():
+            run.add_error(f"Error listing {source_name}: {error}")
+
+        existing_urls = set(
+            session.exec(
+                select(Article.content_url).where(
+                    Article.content_url.in_([record.url for record in records])
                 )
-            )
-            new_articles.append(res.to_json())
-            session.commit()
+            ).all()
+        )
+        new_records: dict[str, ArticleRecord] = {}
+        for record in records:
+            if record.url in existing_urls or record.url in new_records:
+                logger.info(f"Article already exists: {record.url}")
+                continue
+            new_records[record.url] = record
 
-        if len(new_articles) > 0:
-            logger.info(f"Loaded {len(new_articles)} new articles.")
+        sources = {source.name: source for source in source_service.sources}
+        content_urls = {
+            sources[record.source].content_url(url): url
+            for url, record in new_records.items()
+        }
 
-        logger.info("Finished loading latest articles.")
+        fetcher = ArticleFetcherService()
+        bodies = fetcher.fetch_all(list(content_urls), deadline=deadline)
+        if fetcher.timed_out:
+            run.timed_out = True
+            run.add_error("Timed out fetching article contents")
+        for content_url in content_urls.keys() - bodies.keys():
+            run.add_error(f"Could not fetch content: {content_url}")
+
+        fetched = [(new_records[content_urls[url]], body) for url, body in bodies.items()]
+        results = parsing_pool.map(
+            parse_content,
+            [(record.source, body) for record, body in fetched],
+        )
+        for (record, _), (content, error) in zip(fetched, results):
+            if error:
+                logger.error(f"Error parsing article content {record.url}: {error}")
+                run.add_error(f"Error parsing article content {record.url}: {error}")
+            else:
+                record.content = content
 
-    def load_article_content(self, article: Article, session: SessionDep):
-        service = TechCrunchService()
-        content: str = service.get_post_content(article.content_url)
-        article.content = content
-        session.add(article)
+        inserted = self.insert_articles(session, list(new_records.values()))
         session.commit()
-        session.refresh(article)
+        run.items_inserted = inserted
+
+        if inserted > 0:
+            logger.info(f"Loaded {inserted} new articles.")
+
+        logger.info("Finished loading latest articles.")
+        return inserted
+
+    def insert_articles(self, session: Session, records: list[ArticleRecord]) -> int:
+        """
+        Bulk inserts articles, skipping URLs that already exist, and stores the
+        content of the rows that were actually inserted. Does not commit.
+        """
+        if not records:
+            return 0
+
+        now = datetime.now()
+        rows = [
+            {
+                "id": uuid4(),
+                "title": record.title,
+                "content_url": record.url,
+                "created_at": now,
+            }
+            for record in records
+        ]
+        contents = {row["id"]: record.content for row, record in zip(rows, records)}
+        scores = ReadabilityService().score_all(contents)
+        for row in rows:
+            row.update(scores[row["id"]])
+
+        inserted_ids = []
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            inserted_ids += session.execute(
+                insert(Article)
+                .values(rows[i : i + INSERT_BATCH_SIZE])
+                .on_conflict_do_nothing(index_elements=["content_url"])
+                .returning(Article.id)
+            ).scalars().all()
+
+        ArticleContentService().insert_contents(
+            session,
+            {
+                article_id: contents[article_id]
+                for article_id in inserted_ids
+                if contents[article_id]
+            },
+        )
+        return len(inserted_ids)
+
+    def load_article_content_once(self, article_id: UUID, content_url: str) -> Future:
+        """
+        Scrapes the article in the background, sharing a single fetch between
+        all concurrent callers for the same article.
+        """
+        return content_flights.submit(
+            str(article_id),
+            self.refresh_article_content,
+            article_id,
+            content_url,
+        )
+
+    def refresh_article_content(self, article_id: UUID, content_url: str) -> str:
+        source = ArticleSourceService().source_for_url(content_url)
+        if not source:
+            raise ValueError(f"No article source for {content_url}")
+
+        res = http_cache.get(source.content_url(content_url), ttl=source.content_ttl)
+        if res.status_code < 200 or res.status_code >= 300:
+            raise ConnectionRefusedError()
+
+        content: str = parsing_pool.run(parse_content, source.name, res.content)
+        with Session(engine) as session:
+            ArticleContentService().set_content(session, article_id, content)
+            article = session.get(Article, article_id)
+            if article:
+                ReadabilityService().apply(article, content)
+                session.add(article)
+            session.commit()
+        return content
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+
+from sqlmodel import Session
+
+from models.chat_models import ChatMessage
+from services.sqlite_service import engine
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 100
+
+
+class MessageWriter:
+    """
+    Write-behind queue for chat messages. Writes are batched and committed
+    from a worker thread, so callers on the event loop never check out a
+    database connection; they await the returned future when they need the
+    message to be durable.
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue | None = None
+        self.worker: asyncio.Task | None = None
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.create_task(self.run())
+
+    def write(self, message: ChatMessage) -> asyncio.Future:
+        if self.worker is None or self.worker.done():
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((message, future))
+        return future
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty() and len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+
+            try:
+                await asyncio.to_thread(self.save, [message for message, _ in batch])
+            except Exception as e:
+                logger.exception(f"Error saving {len(batch)} chat messages")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    @staticmethod
+    def save(messages: list[ChatMessage]):
+        with Session(engine, expire_on_commit=False) as session:
+            session.add_all(messages)
+            session.commit()
+
+    async def stop(self):
+        """
+        Waits for the queued messages to be saved.
+        """
+        if self.worker is None:
+            return
+
+        await self.queue.join()
+        self.worker.cancel()
+        self.worker = None
+
+
+message_writer = MessageWriter()
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable
+
+
+class ParsingPoolService:
+    """
+    Runs CPU-bound parsing in a process pool so it does not compete with
+    request handling for the GIL.
+
+    With `processes=0` (the default) parsing runs inline in the calling
+    thread. Functions must be module level and take and return plain,
+    picklable values (raw bytes in, records out).
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._executor: Executor | None = None
+
+    def executor(self) -> Executor | None:
+        if self.processes <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn, as forking a process with running threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def run(self, fn: Callable, *args):
+        executor = self.executor()
+        if executor is None:
+            return fn(*args)
+        return executor.submit(fn, *args).result()
+
+    def map(self, fn: Callable, args_list: list[tuple]) -> list[tuple[object, Exception | None]]:
+        """
+        Runs fn for every args tuple and returns (result, error) pairs in
+        order, so a failure in one item does not lose the others.
+        """
+        executor = self.executor()
+        if executor is None:
+            results = []
+            for args in args_list:
+                try:
+                    results.append((fn(*args), None))
+                except Exception as e:
+                    results.append((None, e))
+            return results
+
+        futures = [executor.submit(fn, *args) for args in args_list]
+        return [
+            (None, future.exception()) if future.exception() else (future.result(), None)
+            for future in futures
+        ]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+parsing_pool = ParsingPoolService(int(os.getenv("INGESTION_PARSE_PROCESSES", "0")))
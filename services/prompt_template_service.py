@@ -0,0 +1,97 @@
+import threading
+from functools import lru_cache
+from string import Template
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from models.chat_models import Chat, ChatMessage, MessageRole, PromptTemplate
+from utils.tokens import count_tokens
+
+ENGLISH_TEACHER = "english_teacher"
+DEFAULT_THEME = "general conversation"
+
+# The theme goes last so every chat of a template version shares the same
+# prompt prefix, which is what the provider's prompt cache matches on.
+ENGLISH_TEACHER_V1 = """You are an "English Teacher" for Brazilian people, you speak English and Portuguese fluently, and you are specialized in the conversation theme given at the end.
+The user will talk with you about this theme in English, and sometimes in Portuguese.
+Your tasks are:
+
+- If the user makes a mistake, first correct it (showing the corrected version in a natural way).
+- After correcting, answer the user to keep the conversation flowing.
+- If the user doesn't understand something, explain it in a different way or in Portuguese if the user prefers.
+- Your responses should be short and concise, like a text message.
+
+Keep the conversation natural, immersive, and engaging, like a real-life situation.
+Your main goal: help the user practice English through conversation, correction, and vocabulary expansion, without breaking the immersion of the chosen theme.
+
+Conversation theme: $theme"""
+
+# Current version of each template. Bump the version to change a prompt,
+# existing chats keep rendering the version they were created with.
+PROMPT_TEMPLATES: dict[str, tuple[int, str]] = {
+    ENGLISH_TEACHER: (1, ENGLISH_TEACHER_V1),
+}
+
+# Template rows are immutable, so they are cached for the process lifetime
+_lock = threading.Lock()
+_contents: dict[int, str] = {}
+_current_ids: dict[str, int] = {}
+
+
+@lru_cache(maxsize=1024)
+def render(content: str, theme: str) -> tuple[str, int]:
+    """
+    Rendered prompt and its token count. The same template and theme always
+    render to the same text.
+    """
+    text = Template(content).safe_substitute(theme=theme or DEFAULT_THEME)
+    return text, count_tokens(text)
+
+
+class PromptTemplateService:
+
+    def current_id(self, session: Session, name: str = ENGLISH_TEACHER) -> int:
+        """
+        Id of the current version of a template, stored on first use.
+        """
+        if name in _current_ids:
+            return _current_ids[name]
+
+        version, content = PROMPT_TEMPLATES[name]
+        with _lock:
+            session.execute(
+                insert(PromptTemplate)
+                .values(name=name, version=version, content=content)
+                .on_conflict_do_nothing(index_elements=["name", "version"])
+            )
+            session.commit()
+            template = session.exec(
+                select(PromptTemplate)
+                .where(PromptTemplate.name == name)
+                .where(PromptTemplate.version == version)
+            ).one()
+            _contents[template.id] = template.content
+            _current_ids[name] = template.id
+        return template.id
+
+    def content(self, session: Session, template_id: int) -> str:
+        if template_id not in _contents:
+            template = session.get(PromptTemplate, template_id)
+            if not template:
+                raise ValueError(f"Unknown prompt template: {template_id}")
+            _contents[template_id] = template.content
+        return _contents[template_id]
+
+    def prompt_message(self, session: Session, chat: Chat) -> ChatMessage:
+        """
+        The chat's system prompt as an unsaved developer message.
+        """
+        content, token_count = render(self.content(session, chat.prompt_template_id), chat.theme)
+        return ChatMessage(
+            role=MessageRole.DEVELOPER,
+            content=content,
+            chat_id=chat.id,
+            created_at=chat.created_at,
+            token_count=token_count,
+        )
@@ -0,0 +1,80 @@
+from collections import Counter
+
+from models.article_models import ADVANCED, BEGINNER, INTERMEDIATE, Article
+from utils.text import sentences, syllables, tokenize
+
+# Flesch-Kincaid grade boundaries between the difficulty levels
+BEGINNER_MAX_GRADE = 7.0
+INTERMEDIATE_MAX_GRADE = 11.0
+
+# Words of three or more syllables are counted as complex, as in the Gunning fog index
+COMPLEX_WORD_SYLLABLES = 3
+
+
+class ReadabilityService:
+    """
+    Scores articles once, when their content is stored, into indexed
+    `article` columns so listings can filter by difficulty in SQL.
+    """
+
+    @staticmethod
+    def difficulty(reading_grade: float) -> int:
+        if reading_grade <= BEGINNER_MAX_GRADE:
+            return BEGINNER
+        if reading_grade <= INTERMEDIATE_MAX_GRADE:
+            return INTERMEDIATE
+        return ADVANCED
+
+    def score(self, content: str) -> dict:
+        return self.score_all({None: content})[None]
+
+    def score_all(self, contents: dict) -> dict:
+        """
+        Scores a batch of articles, keyed like `contents`. Each article is
+        reduced to its word counts, and syllables are counted once over the
+        union vocabulary of the batch rather than once per word occurrence.
+        """
+        word_counts = {key: Counter(tokenize(content)) for key, content in contents.items()}
+        vocabulary = set().union(*word_counts.values())
+        word_syllables = {word: syllables(word) for word in vocabulary}
+
+        return {
+            key: self.score_counts(word_counts[key], len(sentences(content)), word_syllables)
+            for key, content in contents.items()
+        }
+
+    def score_counts(
+        self, word_counts: Counter, sentence_count: int, word_syllables: dict[str, int]
+    ) -> dict:
+        word_count = word_counts.total()
+        if not word_count or not sentence_count:
+            return {
+                "avg_sentence_length": None,
+                "reading_ease": None,
+                "reading_grade": None,
+                "complex_word_ratio": None,
+                "difficulty": None,
+            }
+
+        syllable_count = sum(word_syllables[word] * count for word, count in word_counts.items())
+        complex_words = sum(
+            count
+            for word, count in word_counts.items()
+            if word_syllables[word] >= COMPLEX_WORD_SYLLABLES
+        )
+        words_per_sentence = word_count / sentence_count
+        syllables_per_word = syllable_count / word_count
+        reading_grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        return {
+            "avg_sentence_length": round(words_per_sentence, 2),
+            "reading_ease": round(
+                206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2
+            ),
+            "reading_grade": round(reading_grade, 2),
+            "complex_word_ratio": round(complex_words / word_count, 4),
+            "difficulty": self.difficulty(reading_grade),
+        }
+
+    def apply(self, article: Article, content: str) -> None:
+        for column, value in self.score(content).items():
+            setattr(article, column, value)
@@ -1,4 +1,9 @@
-import requests
+import json
+
+from services.http_cache_service import http_cache
+
+RELEVANT_POSTS_TTL = 5 * 60
+POST_CONTENT_TTL = 24 * 60 * 60
 
 
 class TabNewsResponse:
@@ -48,16 +53,23 @@ class TabNewsResponse:
 class TabNewsService:
 
     def __init__(self):
-        self.base_url = "https://www.tabnews.com.br/api/v1"
+        self.site_url = "https://www.tabnews.com.br"
+        self.base_url = self.site_url + "/api/v1"
 
-    def most_relevant_posts(self) -> list[TabNewsResponse]:
-        endpoint = "/contents?page=1&per_page=10&strategy=relevant"
-        url = self.base_url + endpoint
-        res = requests.get(url, timeout=30)
+    def relevant_posts_url(self, page: int = 1, per_page: int = 10) -> str:
+        endpoint = f"/contents?page={page}&per_page={per_page}&strategy=relevant"
+        return self.base_url + endpoint
+
+    def most_relevant_posts(self, page: int = 1, per_page: int = 10) -> list[TabNewsResponse]:
+        url = self.relevant_posts_url(page, per_page)
+        res = http_cache.get(url, ttl=RELEVANT_POSTS_TTL)
         if res.status_code < 200 or res.status_code >= 300:
             raise ConnectionRefusedError()
 
-        articles_response = res.json()
+        return self.parse_relevant_posts(res.content)
+
+    def parse_relevant_posts(self, content: bytes) -> list[TabNewsResponse]:
+        articles_response = json.loads(content)
         response = []
         for article in articles_response:
             tabnews_article = TabNewsResponse.from_dict(article)
@@ -68,13 +80,21 @@ class TabNewsService:
     def get_post_content(self, user: str, slug: str) -> str:
         endpoint = f"/contents/{user}/{slug}"
         url = self.base_url + endpoint
-        res = requests.get(url, timeout=30)
+        res = http_cache.get(url, ttl=POST_CONTENT_TTL)
         if res.status_code < 200 or res.status_code >= 300:
             raise ConnectionRefusedError()
 
-        article_response = res.json()
-        content = article_response.get("body", "")
-        return content
+        return self.parse_post_content(res.content)
+
+    def parse_post_content(self, content: bytes) -> str:
+        article_response = json.loads(content)
+        return article_response.get("body", "")
+
+    def post_url(self, user: str, slug: str) -> str:
+        return f"{self.site_url}/{user}/{slug}"
+
+    def post_api_url(self, post_url: str) -> str:
+        return post_url.replace(self.site_url, self.base_url + "/contents", 1)
 
 
 if __name__ == "__main__":
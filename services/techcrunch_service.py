@@ -1,5 +1,31 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from services.http_cache_service import http_cache
+from utils.markdown import markdown_converter
+
+LATEST_POSTS_TTL = 5 * 60
+POST_CONTENT_TTL = 24 * 60 * 60
+
+# "lxml" is faster when installed, but recovers from broken markup differently
+# than html.parser, so validate it with scripts/benchmark_techcrunch_parsing.py
+HTML_PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+
+def has_class(class_name: str):
+    # While parsing, strainers see the raw class attribute, not the split list
+    def match(value) -> bool:
+        if value is None:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return class_name in classes
+
+    return match
+
+
+LATEST_POSTS_STRAINER = SoupStrainer("div", class_=has_class("loop-card--post-type-post"))
+POST_CONTENT_STRAINER = SoupStrainer("div", class_=has_class("entry-content"))
 
 
 class TechCrunchResponse:
@@ -58,100 +84,77 @@ class TechCrunchService:
     def __init__(self):
         self.base_url = "https://techcrunch.com"
 
-    def latest_posts(self) -> list[TechCrunchResponse]:
-        url = self.base_url + "/latest/"
-        res = requests.get(url, timeout=30)
+    def latest_posts_url(self, page: int = 1) -> str:
+        return self.base_url + ("/latest/" if page == 1 else f"/latest/page/{page}/")
+
+    def latest_posts(self, page: int = 1) -> list[TechCrunchResponse]:
+        url = self.latest_posts_url(page)
+        res = http_cache.get(url, ttl=LATEST_POSTS_TTL)
         if res.status_code < 200 or res.status_code >= 300:
             raise ConnectionRefusedError()
 
-        soup = BeautifulSoup(res.content, "html.parser")
+        return self.parse_latest_posts(res.content)
+
+    def parse_latest_posts(self, content: bytes) -> list[TechCrunchResponse]:
+        # Only build the tree for the post cards, not the whole page
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=LATEST_POSTS_STRAINER)
         cards = soup.find_all("div", class_="loop-card--post-type-post")
-        response = []
-
-        for card in cards:
-            # Title
-            title_tag = card.find("a", class_="loop-card__title-link")
-            title = title_tag.get_text(strip=True) if title_tag else "No Title"
-
-            # URL and Slug
-            link_tag = card.find("a", class_="loop-card__title-link")
-            url = (
-                link_tag["href"] if link_tag and "href" in link_tag.attrs else "No URL"
-            )
-            slug = url.split("/")[-2] if url != "No URL" else "No Slug"
-
-            # Category
-            category_tag = card.find("a", class_="loop-card__cat")
-            category = (
-                category_tag.get_text(strip=True) if category_tag else "No Category"
-            )
-
-            # Published At
-            published_at_tag = card.find("time", class_="loop-card__time")
-            published_at = (
-                published_at_tag["datetime"]
-                if published_at_tag and "datetime" in published_at_tag.attrs
-                else "No Date"
-            )
-
-            # Owner Username
-            owner_username_tag = card.find("a", class_="loop-card__author")
-            owner_username = (
-                owner_username_tag.get_text(strip=True)
-                if owner_username_tag
-                else "No Author"
-            )
-
-            techcrunch_response = TechCrunchResponse(
-                category=category,
-                title=title,
-                url=url,
-                slug=slug,
-                published_at=published_at,
-                owner_username=owner_username,
-            )
-            response.append(techcrunch_response)
-
-        return response
+        return [self.parse_card(card) for card in cards]
+
+    def parse_card(self, card: Tag) -> TechCrunchResponse:
+        # Title, URL and Slug
+        link_tag = card.find("a", class_="loop-card__title-link")
+        title = link_tag.get_text(strip=True) if link_tag else "No Title"
+        url = link_tag["href"] if link_tag and "href" in link_tag.attrs else "No URL"
+        slug = url.split("/")[-2] if url != "No URL" else "No Slug"
+
+        # Category
+        category_tag = card.find("a", class_="loop-card__cat")
+        category = category_tag.get_text(strip=True) if category_tag else "No Category"
+
+        # Published At
+        published_at_tag = card.find("time", class_="loop-card__time")
+        published_at = (
+            published_at_tag["datetime"]
+            if published_at_tag and "datetime" in published_at_tag.attrs
+            else "No Date"
+        )
+
+        # Owner Username
+        owner_username_tag = card.find("a", class_="loop-card__author")
+        owner_username = (
+            owner_username_tag.get_text(strip=True)
+            if owner_username_tag
+            else "No Author"
+        )
+
+        return TechCrunchResponse(
+            category=category,
+            title=title,
+            url=url,
+            slug=slug,
+            published_at=published_at,
+            owner_username=owner_username,
+        )
 
     def get_post_content(self, url: str) -> str:
-        res = requests.get(url, timeout=30)
+        res = http_cache.get(url, ttl=POST_CONTENT_TTL)
         if res.status_code < 200 or res.status_code >= 300:
             raise ConnectionRefusedError()
 
-        soup = BeautifulSoup(res.content, "html.parser")
+        return self.parse_post_content(res.content)
+
+    def parse_post_content(self, content: bytes) -> str:
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=POST_CONTENT_STRAINER)
         content_tag = soup.find("div", class_="entry-content")
 
         if not content_tag:
             return "No Content"
 
-        markdown_content = []
-
-        for element in content_tag.descendants:
-            if element.name == "h1":
-                markdown_content.append(f"\n# {element.get_text(strip=True)}\n")
-            elif element.name == "h2":
-                markdown_content.append(f"\n## {element.get_text(strip=True)}\n")
-            elif element.name == "h3":
-                markdown_content.append(f"\n### {element.get_text(strip=True)}\n")
-            elif element.name == "h4" or element.name == "h5" or element.name == "h6":
-                markdown_content.append(f"\n#### {element.get_text(strip=True)}\n")
-            elif element.name == "p":
-                text = element.get_text(strip=True)
-                if text:
-                    markdown_content.append(f"{text}\n\n")
-            elif element.name == "a" and element.get("href"):
-                markdown_content.append(
-                    f"[{element.get_text(strip=True)}]({element['href']})"
-                )
-            elif element.name == "strong" or element.name == "b":
-                markdown_content.append(f"**{element.get_text(strip=True)}**")
-            elif element.name == "em" or element.name == "i":
-                markdown_content.append(f"*{element.get_text(strip=True)}*")
-            elif element.name == "li":
-                markdown_content.append(f"- {element.get_text(strip=True)}\n")
-
-        return "".join(markdown_content).strip()
+        return self.to_markdown(content_tag)
+
+    def to_markdown(self, content_tag: Tag) -> str:
+        return markdown_converter.convert_tag(content_tag)
 
 
 if __name__ == "__main__":
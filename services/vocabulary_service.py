@@ -0,0 +1,97 @@
+from uuid import UUID
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from models.article_models import ArticleVocabulary
+from models.card_models import Card, CardWord
+from utils.text import vocabulary
+
+# Keeps IN (...) lists well below SQLite's bound parameter limit
+QUERY_CHUNK_SIZE = 5000
+
+
+class VocabularyService:
+    """
+    Article vocabularies are tokenized once, when the content is stored,
+    and the words of the user's card fronts are kept in an inverted index,
+    so the overlap between an article and a deck is a set operation.
+    """
+
+    @staticmethod
+    def article_vocabulary_row(article_id: UUID, content: str) -> dict:
+        words = vocabulary(content)
+        return {
+            "article_id": article_id,
+            "words": " ".join(sorted(words)),
+            "word_count": len(words),
+        }
+
+    def index_article(self, session: Session, article_id: UUID, content: str) -> ArticleVocabulary:
+        row = self.article_vocabulary_row(article_id, content)
+        article_vocabulary = session.get(ArticleVocabulary, article_id)
+        if not article_vocabulary:
+            article_vocabulary = ArticleVocabulary(article_id=article_id)
+
+        article_vocabulary.words = row["words"]
+        article_vocabulary.word_count = row["word_count"]
+        session.add(article_vocabulary)
+        return article_vocabulary
+
+    def index_articles(self, session: Session, contents: dict[UUID, str]) -> None:
+        if not contents:
+            return
+
+        session.execute(
+            insert(ArticleVocabulary),
+            [
+                self.article_vocabulary_row(article_id, content)
+                for article_id, content in contents.items()
+            ],
+        )
+
+    def remove_article(self, session: Session, article_id: UUID) -> None:
+        article_vocabulary = session.get(ArticleVocabulary, article_id)
+        if article_vocabulary:
+            session.delete(article_vocabulary)
+
+    def index_cards(self, session: Session, cards: list[Card]) -> None:
+        if not cards:
+            return
+
+        session.execute(delete(CardWord).where(CardWord.card_id.in_([card.id for card in cards])))
+        rows = [
+            {"card_id": card.id, "user_id": card.author_id, "word": word}
+            for card in cards
+            if card.author_id is not None
+            for word in vocabulary(card.front or "")
+        ]
+        if rows:
+            session.execute(insert(CardWord), rows)
+
+    def remove_card(self, session: Session, card_id: UUID) -> None:
+        session.execute(delete(CardWord).where(CardWord.card_id == card_id))
+
+    def known_words(self, session: Session, user_id: UUID, words: list[str]) -> set[str]:
+        known = set()
+        for i in range(0, len(words), QUERY_CHUNK_SIZE):
+            known.update(
+                session.exec(
+                    select(CardWord.word)
+                    .where(CardWord.user_id == user_id)
+                    .where(CardWord.word.in_(words[i : i + QUERY_CHUNK_SIZE]))
+                    .distinct()
+                ).all()
+            )
+        return known
+
+    def article_overlap(
+        self, session: Session, user_id: UUID, article_vocabulary: ArticleVocabulary
+    ) -> tuple[list[str], list[str]]:
+        """
+        Returns the (new, known) words of the article for the user.
+        """
+        words = article_vocabulary.words.split()
+        known = self.known_words(session, user_id, words)
+        new = [word for word in words if word not in known]
+        return new, sorted(known)
@@ -0,0 +1,74 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from services.ai_limiter_service import AILimiter
+
+
+def assert_idle(limiter: AILimiter):
+    assert limiter.slots._value == limiter.max_concurrency
+    assert limiter.user_slots == {}
+    assert limiter.user_requests == {}
+
+
+def test_acquire_timeout_returns_every_slot():
+    async def run():
+        limiter = AILimiter(max_concurrency=3, max_per_user=100, queue_timeout=0.001)
+
+        async def request():
+            try:
+                async with limiter.slot(uuid4()):
+                    await asyncio.sleep(0.001)
+            except HTTPException as e:
+                assert e.status_code == 503
+
+        await asyncio.gather(*[request() for _ in range(500)])
+        assert_idle(limiter)
+
+    asyncio.run(run())
+
+
+def test_cancel_while_waiting_returns_every_slot():
+    async def run():
+        limiter = AILimiter(max_concurrency=1, max_per_user=1, queue_timeout=5)
+        holder = uuid4()
+        await limiter.acquire(holder)
+
+        waiting_for_user = asyncio.create_task(limiter.acquire(holder))
+        waiting_for_server = asyncio.create_task(limiter.acquire(uuid4()))
+        await asyncio.sleep(0.01)
+        waiting_for_user.cancel()
+        waiting_for_server.cancel()
+        for task in (waiting_for_user, waiting_for_server):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        limiter.release(holder)
+        assert_idle(limiter)
+
+    asyncio.run(run())
+
+
+def test_user_limit_is_429_and_server_limit_is_503():
+    async def run():
+        limiter = AILimiter(max_concurrency=2, max_per_user=1, queue_timeout=0.01)
+        first, second = uuid4(), uuid4()
+        await limiter.acquire(first)
+
+        with pytest.raises(HTTPException) as user_limit:
+            await limiter.acquire(first)
+        assert user_limit.value.status_code == 429
+        assert "Retry-After" in user_limit.value.headers
+
+        await limiter.acquire(second)
+        with pytest.raises(HTTPException) as server_limit:
+            await limiter.acquire(uuid4())
+        assert server_limit.value.status_code == 503
+
+        limiter.release(first)
+        limiter.release(second)
+        assert_idle(limiter)
+
+    asyncio.run(run())
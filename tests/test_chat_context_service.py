@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from models.chat_models import Chat, ChatMessage, MessageRole
+from models.user_models import User  # noqa: F401, registers the user table
+from services.chat_context_service import (AI_HISTORY_MESSAGES, AI_SUMMARY_TRIGGER_TOKENS,
+                                           ChatContextService)
+from utils.tokens import count_tokens
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_messages(session: Session, chat: Chat, contents: list[str], offset: int = 0):
+    for i, content in enumerate(contents):
+        session.add(
+            ChatMessage(
+                chat_id=chat.id,
+                role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                content=content,
+                token_count=count_tokens(content),
+                created_at=START + timedelta(seconds=offset + i),
+            )
+        )
+    session.commit()
+
+
+def build_context(session: Session, chat: Chat):
+    service = ChatContextService()
+    chat, messages, overflow_tokens = service.load(session, chat.id)
+    return service.build(chat, messages, overflow_tokens=overflow_tokens)
+
+
+def test_short_chat_longer_than_tail_does_not_summarize_every_turn(session):
+    chat = Chat(title="Short messages")
+    session.add(chat)
+    add_messages(session, chat, ["Hi, how are you?"] * 60)
+
+    service = ChatContextService()
+    for turn in range(5):
+        context = build_context(session, chat)
+        assert not service.needs_summary(context)
+        add_messages(session, chat, ["Fine, thanks!", "Great."], offset=60 + 2 * turn)
+
+
+def test_summarizes_once_overflow_reaches_trigger(session):
+    chat = Chat(title="Long chat")
+    session.add(chat)
+    words_per_message = AI_SUMMARY_TRIGGER_TOKENS // 10
+    add_messages(session, chat, ["word " * words_per_message] * (AI_HISTORY_MESSAGES + 20))
+
+    context = build_context(session, chat)
+    assert context.overflow_tokens >= AI_SUMMARY_TRIGGER_TOKENS
+    assert ChatContextService().needs_summary(context)
+
+
+def test_summarized_messages_are_not_counted(session):
+    chat = Chat(title="Summarized chat")
+    session.add(chat)
+    add_messages(session, chat, ["word " * 200] * (AI_HISTORY_MESSAGES + 20))
+
+    chat.summary = "Earlier talk."
+    chat.summary_until = START + timedelta(seconds=19)
+    session.add(chat)
+    session.commit()
+
+    context = build_context(session, chat)
+    assert context.overflow_tokens == 0
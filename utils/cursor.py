@@ -0,0 +1,43 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime | None, row_id: UUID) -> str:
+    """
+    Opaque keyset cursor for listings ordered by (created_at, id), newest
+    first. Legacy rows without created_at are encoded with an empty date.
+    """
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id.hex}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at) if created_at else None, UUID(row_id)
+    except ValueError as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def before_cursor(created_at_column, id_column, cursor: str):
+    """
+    Filter for the rows after `cursor` in (created_at desc, id desc) order.
+    SQLite sorts NULL dates last in that order, so they follow every dated row.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    if created_at is None:
+        return and_(created_at_column.is_(None), id_column < row_id)
+
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < row_id),
+        created_at_column.is_(None),
+    )
@@ -2,4 +2,9 @@ class TwilioError(Exception):
     def __init__(self, error, *args):
         self.error = error
         super().__init__(*args)
-    
\ No newline at end of file
+    
+
+class CacheMissError(Exception):
+    def __init__(self, url, *args):
+        self.url = url
+        super().__init__(f"No cached response for {url}", *args)
@@ -0,0 +1,113 @@
+import re
+
+from bs4 import BeautifulSoup, NavigableString, PageElement, Tag
+from bs4.element import PreformattedString
+
+HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 4, "h6": 4}
+BLOCKS = {
+    "p", "div", "section", "article", "header", "footer", "figure",
+    "figcaption", "blockquote", "table", "tr",
+}
+EMPHASIS = {"strong": "**", "b": "**", "em": "*", "i": "*", "code": "`"}
+SKIPPED = {"script", "style", "noscript", "template", "iframe", "svg", "button", "form"}
+
+WHITESPACE = re.compile(r"\s+")
+REPEATED_SPACES = re.compile(r" {2,}")
+SPACE_AFTER_NEWLINE = re.compile(r"\n[ \t]+")
+SPACE_BEFORE_NEWLINE = re.compile(r"[ \t]+\n")
+BLANK_LINES = re.compile(r"\n{3,}")
+CODE_BLOCK = re.compile(r"(\n```\n.*?\n```\n)", re.DOTALL)
+
+
+class MarkdownConverter:
+    """
+    Converts an HTML tree to markdown in a single pass.
+
+    Every node is visited exactly once and every text node is emitted once,
+    with inline markup (links, bold, italic, code) rendered in place inside
+    its block, so nested markup neither duplicates text nor re-walks
+    subtrees.
+    """
+
+    def convert(self, html: str | bytes, parser: str = "html.parser") -> str:
+        return self.convert_tag(BeautifulSoup(html, parser))
+
+    def convert_tag(self, tag: Tag) -> str:
+        # Code blocks are the odd parts of the split and keep their whitespace
+        parts = CODE_BLOCK.split(self.render(tag))
+        for i in range(0, len(parts), 2):
+            parts[i] = self.normalize(parts[i])
+        return BLANK_LINES.sub("\n\n", "".join(parts)).strip()
+
+    @staticmethod
+    def normalize(markdown: str) -> str:
+        markdown = REPEATED_SPACES.sub(" ", markdown)
+        markdown = SPACE_AFTER_NEWLINE.sub("\n", markdown)
+        return SPACE_BEFORE_NEWLINE.sub("\n", markdown)
+
+    def render(self, node: PageElement) -> str:
+        if isinstance(node, NavigableString):
+            if isinstance(node, PreformattedString):
+                return ""
+            return WHITESPACE.sub(" ", str(node))
+
+        name = node.name
+        if name in SKIPPED:
+            return ""
+        if name == "br":
+            return "\n"
+        if name == "pre":
+            return f"\n\n```\n{node.get_text().strip()}\n```\n\n"
+        if name == "ul" or name == "ol":
+            return self.render_list(node, ordered=name == "ol")
+
+        inner = self.render_children(node)
+
+        if name in HEADINGS:
+            text = inner.strip()
+            return f"\n\n{'#' * HEADINGS[name]} {text}\n\n" if text else ""
+        if name in BLOCKS:
+            return f"\n\n{inner.strip()}\n\n"
+        if name == "li":
+            return f"\n- {inner.strip()}\n"
+        if name == "a":
+            href = node.get("href")
+            text = inner.strip()
+            if not href or not text:
+                return inner
+            return self.wrap_inline(inner, f"[{text}]({href})")
+        if name in EMPHASIS:
+            marker = EMPHASIS[name]
+            return self.wrap_inline(inner, f"{marker}{inner.strip()}{marker}")
+        return inner
+
+    def render_children(self, node: Tag) -> str:
+        return "".join(self.render(child) for child in node.children)
+
+    def render_list(self, node: Tag, ordered: bool) -> str:
+        items = []
+        number = 1
+        for child in node.children:
+            if isinstance(child, Tag) and child.name == "li":
+                text = self.render_children(child).strip()
+                if text:
+                    bullet = f"{number}." if ordered else "-"
+                    items.append(f"{bullet} {text}")
+                    number += 1
+            else:
+                text = self.render(child).strip()
+                if text:
+                    items.append(text)
+        return "\n\n" + "\n".join(items) + "\n\n" if items else ""
+
+    @staticmethod
+    def wrap_inline(inner: str, rendered: str) -> str:
+        # Keep the whitespace around the markup outside of it: "a **b** c"
+        if not inner.strip():
+            return inner
+        leading = " " if inner[0].isspace() else ""
+        trailing = " " if inner[-1].isspace() else ""
+        return f"{leading}{rendered}{trailing}"
+
+
+markdown_converter = MarkdownConverter()
@@ -0,0 +1,136 @@
+import gzip
+import re
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "text/markdown",
+    "text/html",
+    "text/plain",
+)
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    encodings = {}
+    for item in value.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        if not name:
+            continue
+
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, raw_value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(raw_value)
+                except ValueError:
+                    quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression for buffered responses.
+
+    Only complete responses (a single body message) with a compressible
+    content type and at least `minimum_size` bytes are compressed. Streaming
+    responses are always passed through untouched so they stay unbuffered,
+    and routes matching `exclude_paths` opt out entirely.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        exclude_paths: list[str] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_paths = [re.compile(path) for path in exclude_paths or []]
+
+    def select_encoding(self, accept_encoding: str) -> str | None:
+        """
+        The supported encoding with the highest q value, brotli on ties.
+        """
+        encodings = parse_accept_encoding(accept_encoding)
+        supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+        selected = max(supported, key=lambda encoding: encodings.get(encoding, 0))
+        if encodings.get(selected, 0) > 0:
+            return selected
+        return None
+
+    def is_excluded(self, path: str) -> bool:
+        return any(pattern.match(path) for pattern in self.exclude_paths)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.is_excluded(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        initial_message: Message = {}
+        started = False
+
+        async def send_with_compression(message: Message) -> None:
+            nonlocal initial_message, started
+
+            if message["type"] == "http.response.start":
+                # Hold the headers until we know whether the body is compressed.
+                initial_message = message
+                return
+
+            if message["type"] != "http.response.body" or started:
+                if not started:
+                    started = True
+                    await send(initial_message)
+                await send(message)
+                return
+
+            started = True
+            headers = MutableHeaders(raw=initial_message["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+
+            should_compress = (
+                not message.get("more_body", False)
+                and "content-encoding" not in headers
+                and len(body) >= self.minimum_size
+                and content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+            )
+            if content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+                headers.add_vary_header("Accept-Encoding")
+
+            if should_compress:
+                body = self.compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                message["body"] = body
+
+            await send(initial_message)
+            await send(message)
+
+        await self.app(scope, receive, send_with_compression)
@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key starts `fn` on a background worker; every
+    caller that arrives while it is still running gets the same Future.
+    Because the work runs on its own executor it keeps going even when the
+    callers stop waiting for it.
+    """
+
+    def __init__(self, max_workers: int = 4, thread_name_prefix: str = "single-flight"):
+        self._lock = threading.Lock()
+        self._flights: dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix,
+        )
+
+    def submit(self, key: str, fn: Callable, *args) -> Future:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._executor.submit(self._run, key, fn, *args)
+                self._flights[key] = flight
+            return flight
+
+    def _run(self, key: str, fn: Callable, *args):
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
@@ -0,0 +1,44 @@
+import re
+from functools import lru_cache
+
+MARKDOWN_LINK_TARGET = re.compile(r"\]\([^)]*\)")
+URL = re.compile(r"https?://\S+")
+WORD = re.compile(r"[a-z]+(?:'[a-z]+)*")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+VOWEL_GROUP = re.compile(r"[aeiouy]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercased English words of a text, in order. Markdown link targets and
+    URLs are dropped so they don't count as vocabulary.
+    """
+    text = MARKDOWN_LINK_TARGET.sub("]", text or "")
+    text = URL.sub(" ", text)
+    return WORD.findall(text.lower().replace("’", "'"))
+
+
+def vocabulary(text: str) -> set[str]:
+    return set(tokenize(text))
+
+
+def sentences(text: str) -> list[str]:
+    """
+    Sentences of a markdown text. Line breaks also end a sentence, so
+    headings and list items without punctuation are not merged together.
+    """
+    return [
+        sentence
+        for sentence in SENTENCE_BREAK.split(text or "")
+        if WORD.search(sentence.lower())
+    ]
+
+
+@lru_cache(maxsize=65536)
+def syllables(word: str) -> int:
+    # Vowel groups, ignoring a silent final "e"; good enough for ranking texts
+    word = word.replace("'", "")
+    count = len(VOWEL_GROUP.findall(word))
+    if count > 1 and word.endswith("e") and not word.endswith(("le", "ee")):
+        count -= 1
+    return max(count, 1)
@@ -0,0 +1,29 @@
+import logging
+import math
+import os
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional, token counts are estimated without it
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    global _encoding
+    if tiktoken is not None and _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception:
+            logger.warning("Could not load the tokenizer, estimating token counts")
+            _encoding = False
+
+    if _encoding:
+        return len(_encoding.encode(text or ""))
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)